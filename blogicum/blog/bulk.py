@@ -0,0 +1,93 @@
+"""Массовая загрузка данных в обход save() и сигналов."""
+from contextlib import contextmanager
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import connections
+from django.utils import timezone
+
+from blog.cache import bump_feed_page_version, bump_post_card_version
+from blog.models import (
+    Category, Comment, Location, Post, User, recount_comments)
+
+# Порядок вставки: сначала модели, на которые ссылаются остальные.
+MODELS = (Category, Location, User, Post, Comment)
+
+
+def auto_date_fields(model):
+    return [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False)
+        or getattr(field, 'auto_now_add', False)
+    ]
+
+
+@contextmanager
+def keep_auto_dates(models=MODELS):
+    """Отключает auto_now и auto_now_add, чтобы сохранить даты из данных.
+
+    Так же поступает loaddata. Отдаёт словарь модель -> такие поля;
+    пустые даты в них заполняет fill_auto_dates().
+    """
+    fields = {model: auto_date_fields(model) for model in models}
+    saved = [(field, field.auto_now, field.auto_now_add)
+             for model_fields in fields.values() for field in model_fields]
+    for field, _, _ in saved:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield fields
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+def fill_auto_dates(objects, fields):
+    now = timezone.now()
+    for obj in objects:
+        for field in fields:
+            if getattr(obj, field.attname) is None:
+                setattr(obj, field.attname, now)
+
+
+@contextmanager
+def deferred_indexes(models=MODELS, using='default'):
+    """Удаляет индексы из Meta.indexes на время загрузки.
+
+    Построить индекс по готовой таблице быстрее, чем обновлять его
+    при вставке каждой строки. Индексы внешних ключей не трогаются.
+    """
+    indexed = [(model, index)
+               for model in models for index in model._meta.indexes]
+    with connections[using].schema_editor() as editor:
+        for model, index in indexed:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connections[using].schema_editor() as editor:
+            for model, index in indexed:
+                editor.add_index(model, index)
+
+
+def insert_in_batches(model, objects, batch_size, using='default'):
+    """Вставляет объекты из итератора пачками, возвращает их число."""
+    objects = iter(objects)
+    count = 0
+    while batch := list(islice(objects, batch_size)):
+        model.objects.using(using).bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+def finish_bulk_load(models=MODELS, using='default', recount=True):
+    """Делает то, что при обычном save() сделали бы база и сигналы."""
+    connection = connections[using]
+    # Последовательности PostgreSQL не знают о вставленных явно id.
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    if recount and Comment in models:
+        recount_comments(Post.objects.using(using))
+    bump_feed_page_version()
+    bump_post_card_version()
@@ -0,0 +1,55 @@
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+
+POST_CARD_VERSION_KEY = 'post_card_version'
+FEED_PAGE_VERSION_KEY = 'feed_page_version'
+
+
+def get_version(key):
+    return cache.get_or_set(key, time.time_ns(), None)
+
+
+def bump_version(key):
+    # Если ключ вытеснен, новая метка всё равно не совпадёт со старыми.
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def get_post_card_version():
+    return get_version(POST_CARD_VERSION_KEY)
+
+
+def bump_post_card_version():
+    bump_version(POST_CARD_VERSION_KEY)
+
+
+def post_card_key(post, version):
+    return (f'post_card:{version}:{post.pk}:'
+            f'{post.updated_at.timestamp()}:{post.comment_count}')
+
+
+def get_post_card(post, version):
+    return cache.get(post_card_key(post, version))
+
+
+def set_post_card(post, version, html):
+    cache.set(post_card_key(post, version), html,
+              settings.POST_CARD_CACHE_TIMEOUT)
+
+
+def delete_post_card(post):
+    cache.delete(post_card_key(post, get_post_card_version()))
+
+
+def bump_feed_page_version():
+    bump_version(FEED_PAGE_VERSION_KEY)
+
+
+def feed_page_key(request):
+    path = md5(request.get_full_path().encode()).hexdigest()
+    return f'feed_page:{get_version(FEED_PAGE_VERSION_KEY)}:{path}'
@@ -1,5 +1,6 @@
 from django import forms
 from django.core.exceptions import ValidationError
+from django.core.validators import validate_image_file_extension
 from django.db.models import Q
 
 from .models import Category, Comment, Location, Post, User
@@ -10,6 +11,12 @@ class PostForm(forms.ModelForm):
         queryset=Category.objects.filter(is_published=True))
     location = forms.ModelChoiceField(
         queryset=Location.objects.filter(is_published=True))
+    # Изображение проверяется и обрабатывается в фоне (blog.tasks).
+    image = forms.FileField(
+        label='Фото',
+        required=False,
+        validators=[validate_image_file_extension],
+        widget=forms.ClearableFileInput(attrs={'accept': 'image/*'}))
 
     class Meta:
         model = Post
@@ -0,0 +1,105 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from blog.models import Category, Location, Post, User
+
+BATCH_SIZE = 10000
+SEED_GROUPS = 10
+
+
+class Command(BaseCommand):
+    help = ('Показывает планы запросов и время отрисовки страниц '
+            'общей ленты, ленты категории и ленты автора.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--posts', type=int, default=0,
+            help='Дополнить базу публикациями до указанного количества.')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Количество замеров для каждой страницы.')
+
+    def handle(self, *args, **options):
+        if options['posts']:
+            self.seed(options['posts'])
+        post = Post.published.order_by('-pub_date').first()
+        if post is None:
+            self.stderr.write('Нет опубликованных постов для замеров.')
+            return
+        feeds = (
+            ('blog:index', {}, Post.published.all()),
+            ('blog:category_posts',
+             {'category_slug': post.category.slug},
+             post.category.posts(manager='published').all()),
+            ('blog:profile',
+             {'username': post.author.username},
+             post.author.posts(manager='published').all()),
+        )
+        self.stdout.write(f'Backend: {connection.vendor}')
+        for name, kwargs, queryset in feeds:
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(
+                queryset[:settings.POSTS_ON_PAGE].explain())
+            timings = self.measure(reverse(name, kwargs=kwargs),
+                                   options['repeat'])
+            self.stdout.write(
+                f'median {statistics.median(timings):.1f} ms, '
+                f'max {max(timings):.1f} ms\n')
+
+    def measure(self, url, repeat):
+        factory = RequestFactory()
+        match = resolve(url)
+        # Замеряется запрос ленты, а не попадание в кэш страниц.
+        view = match.func.view_class.as_view(
+            **match.func.view_initkwargs, feed_cache_enabled=False)
+        timings = []
+        for _ in range(repeat):
+            request = factory.get(url)
+            request.user = AnonymousUser()
+            start = time.perf_counter()
+            response = view(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def seed(self, total):
+        missing = total - Post.objects.count()
+        if missing <= 0:
+            return
+        authors = [User.objects.get_or_create(username=f'bench{i}')[0]
+                   for i in range(SEED_GROUPS)]
+        categories = [
+            Category.objects.get_or_create(
+                slug=f'bench{i}',
+                defaults={'title': f'bench{i}', 'description': ''})[0]
+            for i in range(SEED_GROUPS)]
+        location, _ = Location.objects.get_or_create(name='bench')
+        now = timezone.now()
+        rng = random.Random(0)
+        while missing > 0:
+            size = min(missing, BATCH_SIZE)
+            Post.objects.bulk_create(
+                Post(
+                    title='bench',
+                    text='bench',
+                    author=rng.choice(authors),
+                    category=rng.choice(categories),
+                    location=location,
+                    is_published=rng.random() > 0.05,
+                    pub_date=now - timedelta(minutes=rng.randint(-1440,
+                                                                 10 ** 6)),
+                ) for _ in range(size)
+            )
+            missing -= size
+            self.stdout.write(f'Осталось создать: {missing}')
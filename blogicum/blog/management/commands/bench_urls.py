@@ -0,0 +1,166 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post, User
+from blog.urls import app_name, urlpatterns
+from core.metrics import QueryTimer
+
+# Размеры страниц, между которыми число запросов не должно меняться.
+PAGE_SIZES = (2, 10)
+
+# Отдельный кэш процесса: очистка и смена версий при создании данных не
+# затрагивают общий кэш сайта (Redis, memcached).
+BENCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench_urls',
+    },
+}
+
+
+class Command(BaseCommand):
+    help = ('Замеряет число и время SQL-запросов, время отрисовки и '
+            'задержку всех маршрутов blog и проверяет отсутствие N+1.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--output', help='Файл для JSON-отчёта.')
+
+    def handle(self, *args, **options):
+        # Данные создаются в транзакции, которая затем откатывается.
+        with override_settings(CACHES=BENCH_CACHES), transaction.atomic():
+            routes = self.seed(options['posts'], options['comments'])
+            report = {
+                name: self.bench(url, options['repeat'])
+                for name, url in routes.items()
+            }
+            transaction.set_rollback(True)
+        self.stdout.write(f'Backend: {connection.vendor}')
+        for name, result in report.items():
+            self.stdout.write(
+                f'{name}: {result["queries"]} queries '
+                f'({result["query_ms"]:.1f} ms), '
+                f'render {result["render_ms"]:.1f} ms, '
+                f'p50 {result["p50_ms"]:.1f} ms, '
+                f'p95 {result["p95_ms"]:.1f} ms')
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                json.dump({
+                    'vendor': connection.vendor,
+                    'posts': options['posts'],
+                    'comments': options['comments'],
+                    'repeat': options['repeat'],
+                    'routes': report,
+                }, report_file, indent=2, ensure_ascii=False)
+        growing = [name for name, result in report.items()
+                   if len(set(result['queries_by_page_size'].values())) > 1]
+        if growing:
+            raise CommandError(
+                'Число запросов зависит от размера страницы: '
+                + ', '.join(growing))
+
+    def seed(self, posts, comments):
+        self.user = User.objects.create(username='bench_urls')
+        category = Category.objects.create(
+            title='bench', slug='bench-urls', description='')
+        location = Location.objects.create(name='bench')
+        now = timezone.now()
+        Post.objects.bulk_create(
+            Post(title=f'bench {i}', text='bench', author=self.user,
+                 category=category, location=location,
+                 pub_date=now - timedelta(hours=i))
+            for i in range(max(posts, max(PAGE_SIZES) + 1))
+        )
+        post = Post.objects.filter(author=self.user).latest('pub_date')
+        Comment.objects.bulk_create(
+            Comment(text='bench', post=post, author=self.user)
+            for _ in range(max(comments, max(PAGE_SIZES) + 1))
+        )
+        comment = post.comments.first()
+        kwargs = {
+            'index': {},
+            'category_posts': {'category_slug': category.slug},
+            'post_detail': {'pk': post.pk},
+            'post_comments': {'pk': post.pk},
+            'create_post': {},
+            'edit_post': {'pk': post.pk},
+            'delete_post': {'pk': post.pk},
+            'add_comment': {'post_pk': post.pk},
+            'edit_comment': {'post_pk': post.pk, 'pk': comment.pk},
+            'delete_comment': {'post_pk': post.pk, 'pk': comment.pk},
+            'profile': {'username': self.user.username},
+            'edit_profile': {},
+        }
+        routes = {}
+        for pattern in urlpatterns:
+            if pattern.name not in kwargs:
+                raise CommandError(
+                    f'Нет параметров для маршрута {pattern.name}.')
+            name = f'{app_name}:{pattern.name}'
+            routes[name] = reverse(name, kwargs=kwargs[pattern.name])
+        return routes
+
+    def request(self, url):
+        request = RequestFactory().get(url)
+        request.user = self.user
+        match = resolve(url)
+        timer = QueryTimer()
+        with connection.execute_wrapper(timer):
+            start = time.perf_counter()
+            response = match.func(request, *match.args, **match.kwargs)
+            rendered = time.perf_counter()
+            if hasattr(response, 'render'):
+                response.render()
+            finished = time.perf_counter()
+        if response.status_code != 200:
+            raise CommandError(
+                f'{url} ответил со статусом {response.status_code}.')
+        return {
+            'queries': timer.count,
+            'query_ms': timer.seconds * 1000,
+            'render_ms': (finished - rendered) * 1000,
+            'total_ms': (finished - start) * 1000,
+        }
+
+    def bench(self, url, repeat):
+        view_class = resolve(url).func.view_class
+        queries_by_page_size = {}
+        for page_size in PAGE_SIZES:
+            with override_settings(COMMENTS_ON_PAGE=page_size):
+                paginate_by = getattr(view_class, 'paginate_by', None)
+                if paginate_by:
+                    view_class.paginate_by = page_size
+                try:
+                    cache.clear()
+                    queries_by_page_size[page_size] = self.request(
+                        url)['queries']
+                finally:
+                    if paginate_by:
+                        view_class.paginate_by = paginate_by
+        runs = [self.request(url) for _ in range(repeat)]
+        latencies = [run['total_ms'] for run in runs]
+        if len(latencies) > 1:
+            p95 = statistics.quantiles(latencies, n=20)[-1]
+        else:
+            p95 = latencies[0]
+        return {
+            'url': url,
+            'queries': runs[-1]['queries'],
+            'queries_by_page_size': queries_by_page_size,
+            'query_ms': statistics.median(run['query_ms'] for run in runs),
+            'render_ms': statistics.median(run['render_ms'] for run in runs),
+            'p50_ms': statistics.median(latencies),
+            'p95_ms': p95,
+        }
@@ -0,0 +1,146 @@
+import json
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from django.core import serializers
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from blog.bulk import (
+    MODELS, deferred_indexes, fill_auto_dates, finish_bulk_load,
+    keep_auto_dates)
+
+CHUNK_SIZE = 1 << 16
+
+NDJSON_SUFFIXES = ('.ndjson', '.jsonl')
+
+
+def iter_json_array(stream, chunk_size=CHUNK_SIZE):
+    """Читает объекты JSON-массива по одному, не загружая файл целиком."""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(chunk_size).lstrip()
+    if not buffer.startswith('['):
+        raise CommandError('Фикстура должна быть JSON-массивом.')
+    buffer = buffer[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip(' \t\r\n,')
+        if buffer.startswith(']'):
+            return
+        try:
+            obj, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise CommandError('Фикстура содержит неверный JSON.')
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield obj
+        buffer = buffer[end:]
+
+
+def iter_ndjson(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = ('Быстро загружает фикстуры формата loaddata (JSON или NDJSON) '
+            'через bulk_create, без сигналов. Загружаются категории, '
+            'местоположения, пользователи, публикации и комментарии; '
+            'остальные модели пропускаются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixtures', nargs='+')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--keep-indexes', action='store_true',
+            help='Не удалять индексы публикаций на время загрузки.')
+        parser.add_argument(
+            '--ignore-conflicts', action='store_true',
+            help='Пропускать строки с уже существующими id.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        self.using = options['database']
+        self.batch_size = options['batch_size']
+        self.ignore_conflicts = options['ignore_conflicts']
+        self.labels = {model._meta.label_lower: model for model in MODELS}
+        self.batches = defaultdict(list)
+        self.loaded = Counter()
+        self.skipped = Counter()
+        paths = [Path(fixture) for fixture in options['fixtures']]
+        for path in paths:
+            if not path.is_file():
+                raise CommandError(f'Файл {path} не найден.')
+        start = time.perf_counter()
+        with keep_auto_dates() as self.date_fields:
+            if options['keep_indexes']:
+                self.load(paths)
+            else:
+                with deferred_indexes(using=self.using):
+                    self.load(paths)
+        finish_bulk_load(using=self.using)
+        self.report(time.perf_counter() - start)
+
+    def load(self, paths):
+        with transaction.atomic(using=self.using):
+            for path in paths:
+                with path.open(encoding='utf-8') as stream:
+                    if path.suffix in NDJSON_SUFFIXES:
+                        objects = iter_ndjson(stream)
+                    else:
+                        objects = iter_json_array(stream)
+                    self.load_objects(objects)
+            for model in MODELS:
+                self.flush(model)
+
+    def load_objects(self, objects):
+        supported = self.filter_supported(objects)
+        for deserialized in serializers.deserialize(
+                'python', supported, using=self.using,
+                ignorenonexistent=True):
+            obj = deserialized.object
+            model = type(obj)
+            self.batches[model].append(obj)
+            if len(self.batches[model]) >= self.batch_size:
+                self.flush(model)
+
+    def filter_supported(self, objects):
+        for obj in objects:
+            if obj.get('model') in self.labels:
+                yield obj
+            else:
+                self.skipped[obj.get('model')] += 1
+
+    def flush(self, model):
+        # Сначала строки, на которые могут ссылаться строки этой модели.
+        for dependency in MODELS[:MODELS.index(model)]:
+            if self.batches[dependency]:
+                self.flush(dependency)
+        batch = self.batches.pop(model, [])
+        if not batch:
+            return
+        fill_auto_dates(batch, self.date_fields[model])
+        model.objects.using(self.using).bulk_create(
+            batch, batch_size=self.batch_size,
+            ignore_conflicts=self.ignore_conflicts)
+        self.loaded[model] += len(batch)
+        if self.verbosity >= 2:
+            self.stdout.write(
+                f'{model._meta.label}: {self.loaded[model]}')
+
+    def report(self, seconds):
+        total = sum(self.loaded.values())
+        for model in MODELS:
+            if self.loaded[model]:
+                self.stdout.write(f'{model._meta.label}: {self.loaded[model]}')
+        for label, count in self.skipped.items():
+            self.stdout.write(f'Пропущено {label}: {count}')
+        self.stdout.write(
+            f'Загружено объектов: {total} за {seconds:.1f} с '
+            f'({total / max(seconds, 1e-9):.0f} объектов/с)')
@@ -0,0 +1,259 @@
+import random
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from mixer.backend.django import Mixer
+
+from blog.bulk import (
+    MODELS, deferred_indexes, finish_bulk_load, insert_in_batches,
+    keep_auto_dates)
+from blog.models import Category, Comment, Location, Post, User
+
+# Размер наборов текстов от Faker, из которых собираются публикации.
+TEXT_POOL_SIZE = 500
+
+
+@contextmanager
+def seeded_mixer(seed, locale='ru'):
+    """Mixer с воспроизводимыми значениями.
+
+    Faker и random у всех экземпляров mixer общие, поэтому их состояние
+    восстанавливается после генерации.
+    """
+    mixer = Mixer(commit=False)
+    faker = mixer.faker
+    saved = faker.locale, faker.random, random.getstate()
+    faker.locale = locale
+    faker.random = random.Random(seed)
+    random.seed(seed)
+    try:
+        yield mixer
+    finally:
+        faker.locale, faker.random = saved[:2]
+        random.setstate(saved[2])
+
+
+class Command(BaseCommand):
+    help = ('Создаёт синтетические данные для нагрузочных тестов: '
+            'пользователей, категории, местоположения, публикации и '
+            'комментарии со степенным распределением по публикациям. '
+            'При одинаковых --seed и --now данные совпадают.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument(
+            '--future-fraction', type=float, default=0.05,
+            help='Доля отложенных публикаций с pub_date в будущем.')
+        parser.add_argument(
+            '--unpublished-ratio', type=float, default=0.05,
+            help='Доля снятых с публикации постов.')
+        parser.add_argument(
+            '--comments-exponent', type=float, default=1.2,
+            help='Показатель степенного закона числа комментариев.')
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='За сколько дней распределены даты публикаций.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--now', type=parse_datetime,
+            help='Момент, от которого отсчитываются даты (ISO 8601).')
+        parser.add_argument(
+            '--password',
+            help='Пароль всех созданных пользователей; по умолчанию '
+                 'войти под ними нельзя.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--keep-indexes', action='store_true',
+            help='Не удалять индексы публикаций на время вставки.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        self.validate(options)
+        self.options = options
+        self.using = options['database']
+        self.now = options['now'] or timezone.now()
+        self.rng = random.Random(options['seed'])
+        start = time.perf_counter()
+        with seeded_mixer(options['seed']) as self.mixer, keep_auto_dates():
+            self.fake = self.mixer.faker
+            if options['keep_indexes']:
+                self.generate()
+            else:
+                with deferred_indexes(using=self.using):
+                    self.generate()
+        finish_bulk_load(using=self.using, recount=False)
+        seconds = time.perf_counter() - start
+        total = sum(self.created.values())
+        for model in MODELS:
+            self.stdout.write(f'{model._meta.label}: {self.created[model]}')
+        self.stdout.write(
+            f'Создано объектов: {total} за {seconds:.1f} с '
+            f'({total / max(seconds, 1e-9):.0f} объектов/с)')
+
+    @staticmethod
+    def validate(options):
+        for name in ('users', 'categories', 'locations', 'posts',
+                     'comments', 'days'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} не может быть отрицательным.')
+        for name in ('future_fraction', 'unpublished_ratio'):
+            if not 0 <= options[name] <= 1:
+                raise CommandError(
+                    f'--{name.replace("_", "-")} должно быть от 0 до 1.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должно быть больше 0.')
+        if options['posts'] and not (options['users']
+                                     and options['categories']):
+            raise CommandError(
+                'Для публикаций нужны --users и --categories больше 0.')
+        if options['comments'] and not (options['posts']
+                                        and options['users']):
+            raise CommandError(
+                'Для комментариев нужны --posts и --users больше 0.')
+
+    def generate(self):
+        self.created = {}
+        with transaction.atomic(using=self.using):
+            self.categories = self.insert(Category, self.make_categories)
+            self.locations = self.insert(Location, self.make_locations)
+            self.users = self.insert(User, self.make_users)
+            self.scheduled = bytearray(
+                self.rng.random() < self.options['future_fraction']
+                for _ in range(self.options['posts']))
+            counts = self.comment_counts()
+            # Даты публикаций нужны, чтобы комментарии были не раньше них.
+            self.post_dates = array('d')
+            self.posts = self.insert(
+                Post, lambda first: self.make_posts(counts))
+            self.insert(Comment, lambda first: self.make_comments(counts))
+
+    def insert(self, model, make_objects):
+        """Вставляет объекты с id подряд после текущего максимума.
+
+        make_objects получает первый id, чтобы строить из него
+        уникальные значения.
+        """
+        first = (model.objects.using(self.using).aggregate(
+            last=Max('pk'))['last'] or 0) + 1
+        count = insert_in_batches(
+            model, self.with_pks(make_objects(first), first),
+            self.options['batch_size'], using=self.using)
+        self.created[model] = count
+        return range(first, first + count)
+
+    @staticmethod
+    def with_pks(objects, first):
+        for pk, obj in enumerate(objects, start=first):
+            obj.pk = pk
+            yield obj
+
+    def past_date(self):
+        return self.now - timedelta(
+            seconds=self.rng.uniform(0, self.options['days'] * 86400))
+
+    def make_categories(self, first):
+        for pk in range(first, first + self.options['categories']):
+            yield self.mixer.blend(
+                Category, slug=f'category-{pk}',
+                is_published=True, created_at=self.past_date())
+
+    def make_locations(self, first):
+        for _ in range(self.options['locations']):
+            yield self.mixer.blend(
+                Location, name=self.fake.city(), is_published=True,
+                created_at=self.past_date())
+
+    def make_users(self, first):
+        password = self.options['password']
+        password = make_password(password) if password else '!'
+        for pk in range(first, first + self.options['users']):
+            yield self.mixer.blend(
+                User, username=f'{self.fake.user_name()}{pk}',
+                password=password, is_staff=False, is_superuser=False,
+                is_active=True, date_joined=self.past_date())
+
+    def comment_counts(self):
+        """Число комментариев у каждой публикации.
+
+        Публикация с рангом r получает комментарий с вероятностью,
+        пропорциональной r ** -exponent: немногие посты собирают
+        большую часть обсуждений. Отложенные публикации без комментариев.
+        """
+        posts = self.options['posts']
+        counts = array('L', bytes(array('L').itemsize * posts))
+        if not posts:
+            return counts
+        ranks = list(range(posts))
+        self.rng.shuffle(ranks)
+        exponent = self.options['comments_exponent']
+        weights = list(accumulate(
+            0 if scheduled else (rank + 1) ** -exponent
+            for rank, scheduled in zip(ranks, self.scheduled)))
+        if not weights[-1]:
+            return counts
+        remaining = self.options['comments']
+        while remaining:
+            size = min(remaining, self.options['batch_size'])
+            for index in self.rng.choices(
+                    range(posts), cum_weights=weights, k=size):
+                counts[index] += 1
+            remaining -= size
+        return counts
+
+    def text_pool(self, make):
+        return [make() for _ in range(TEXT_POOL_SIZE)]
+
+    def make_posts(self, counts):
+        titles = self.text_pool(lambda: self.fake.sentence(nb_words=4))
+        texts = self.text_pool(lambda: self.fake.paragraph(nb_sentences=6))
+        unpublished = self.options['unpublished_ratio']
+        for comment_count, scheduled in zip(counts, self.scheduled):
+            if scheduled:
+                pub_date = self.now + timedelta(
+                    seconds=self.rng.uniform(60, 30 * 86400))
+            else:
+                pub_date = self.past_date()
+            self.post_dates.append(pub_date.timestamp())
+            yield Post(
+                title=self.rng.choice(titles)[:256],
+                text=self.rng.choice(texts),
+                pub_date=pub_date,
+                created_at=min(pub_date, self.now),
+                updated_at=min(pub_date, self.now),
+                is_published=self.rng.random() >= unpublished,
+                author_id=self.rng.choice(self.users),
+                category_id=self.rng.choice(self.categories),
+                location_id=(self.rng.choice(self.locations)
+                             if self.locations else None),
+                comment_count=comment_count,
+            )
+
+    def make_comments(self, counts):
+        texts = self.text_pool(lambda: self.fake.sentence(nb_words=10))
+        now = self.now.timestamp()
+        for post_id, comment_count, pub_date in zip(
+                self.posts, counts, self.post_dates):
+            first = min(pub_date, now)
+            last = min(first + 7 * 86400, now)
+            for _ in range(comment_count):
+                created_at = self.rng.uniform(first, last)
+                yield Comment(
+                    text=self.rng.choice(texts),
+                    post_id=post_id,
+                    author_id=self.rng.choice(self.users),
+                    created_at=datetime.fromtimestamp(
+                        created_at, timezone.utc),
+                )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.tasks import process_post_image
+from core.jobs import enqueue
+
+
+class Command(BaseCommand):
+    help = ('Обрабатывает уже загруженные изображения публикаций так же, '
+            'как новые: очищает метаданные, даёт имя по хэшу содержимого '
+            'и создаёт миниатюры.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Обработать заново и уже обработанные публикации.')
+        parser.add_argument(
+            '--enqueue', action='store_true',
+            help='Поставить задачи в очередь run_jobs вместо обработки '
+                 'на месте.')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='')
+        if not options['force']:
+            posts = posts.filter(has_thumbnails=False)
+        post_ids = list(posts.values_list('pk', flat=True))
+        if options['enqueue']:
+            for post_id in post_ids:
+                enqueue('blog.tasks.process_post_image', post_id=post_id)
+            self.stdout.write(f'Поставлено в очередь: {len(post_ids)}')
+            return
+        for post_id in post_ids:
+            process_post_image(post_id)
+        created = Post.objects.filter(
+            pk__in=post_ids, has_thumbnails=True).count()
+        self.stdout.write(
+            f'Обработано: {created}, с ошибками: {len(post_ids) - created}')
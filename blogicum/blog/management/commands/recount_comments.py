@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import recount_comments
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает Post.comment_count по таблице комментариев, '
+            'например после loaddata.')
+
+    def handle(self, *args, **options):
+        updated = recount_comments()
+        self.stdout.write(f'Обновлено публикаций: {updated}')
@@ -1,16 +1,110 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.utils import timezone
 
+from blog.cache import feed_page_key
 from blog.forms import CommentForm, PostForm
-from blog.models import Comment, Post
+from blog.models import Comment, Post, published_now
+from blog.paginators import CursorPaginator
+from core.metrics import render_timed
 
 
 class PostModelMixin:
     model = Post
 
 
+class CursorPaginationMixin:
+    cursor_pagination = settings.POSTS_CURSOR_PAGINATION
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.cursor_pagination:
+            return super().paginate_queryset(queryset, page_size)
+        page = CursorPaginator(queryset, page_size).page(
+            after=self.request.GET.get('after'),
+            before=self.request.GET.get('before'))
+        return (None, page, page.object_list, page.has_other_pages())
+
+
+class AnonymousFeedCacheMixin:
+    """Кэширует ленты для анонимных GET-запросов.
+
+    Время жизни записи не превышает срока до ближайшей отложенной
+    публикации из get_scheduled_posts(), чтобы она появилась вовремя.
+    Замеры отключают кэш через as_view(feed_cache_enabled=False).
+    """
+
+    feed_cache_enabled = True
+
+    def dispatch(self, request, *args, **kwargs):
+        if (not self.feed_cache_enabled or request.method != 'GET'
+                or request.user.is_authenticated):
+            return super().dispatch(request, *args, **kwargs)
+        key = feed_page_key(request)
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = self.get_cache_timeout()
+            if timeout > 0:
+                cache.set(
+                    key, render_timed(request, response).content, timeout)
+        return response
+
+    def get_scheduled_posts(self):
+        raise NotImplementedError
+
+    def get_cache_timeout(self):
+        # Пост с pub_date в текущем интервале округления тоже ещё скрыт.
+        next_pub_date = self.get_scheduled_posts().filter(
+            pub_date__gt=published_now()
+        ).order_by('pub_date').values_list('pub_date', flat=True).first()
+        if next_pub_date is None:
+            return settings.FEED_PAGE_CACHE_TIMEOUT
+        visible_at = next_pub_date + timedelta(
+            seconds=settings.PUBLISHED_NOW_GRANULARITY)
+        return min(settings.FEED_PAGE_CACHE_TIMEOUT,
+                   int((visible_at - timezone.now()).total_seconds()))
+
+
+class PostCommentsMixin:
+    def get_visible_post(self, pk):
+        post = get_object_or_404(Post.detailed, pk=pk)
+        if (post.author_id != self.request.user.id
+                and not post.is_visible()):
+            raise Http404
+        return post
+
+    def get_comments_page(self, post):
+        return CursorPaginator(
+            post.comments(manager='detailed').with_author(),
+            settings.COMMENTS_ON_PAGE,
+            field='created_at',
+            descending=False,
+        ).page(after=self.request.GET.get('after'))
+
+
+class CachedObjectMixin:
+    """Запрашивает объект SingleObjectMixin один раз за запрос."""
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_cached_object'):
+            self._cached_object = super().get_object(queryset)
+        return self._cached_object
+
+
+class PostAuthorMixin(CachedObjectMixin):
+    def is_post_author(self):
+        return self.get_object().author_id == self.request.user.id
+
+
 class PostsUpdateMixin(PostModelMixin, LoginRequiredMixin):
     template_name = 'blog/create.html'
     form_class = PostForm
@@ -20,7 +114,7 @@ class PostRedirectToSelfMixin():
     def link_to_post(self):
         return reverse_lazy(
             'blog:post_detail',
-            kwargs={'pk': self.get_object().pk})
+            kwargs={'pk': self.kwargs['pk']})
 
     def get_success_url(self):
         return self.link_to_post()
@@ -39,12 +133,23 @@ class CommentMixin(LoginRequiredMixin):
     template_name = 'blog/comment.html'
 
     def dispatch(self, request, *args, **kwargs):
-        get_object_or_404(Post, pk=kwargs['post_pk'])
+        self.check_post_exists()
         return super().dispatch(request, *args, **kwargs)
 
+    def check_post_exists(self):
+        if not Post.objects.filter(pk=self.kwargs['post_pk']).exists():
+            raise Http404
+
+
+class CommentAuthorizedMixin(CachedObjectMixin, CommentMixin):
+    def get_queryset(self):
+        return super().get_queryset().filter(post_id=self.kwargs['post_pk'])
 
-class CommentAuthorizedMixin(CommentMixin):
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if self.get_object().author_id != request.user.id:
             raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
+
+    def check_post_exists(self):
+        # Комментарий выбран по post_pk, значит публикация существует.
+        pass
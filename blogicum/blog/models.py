@@ -1,10 +1,16 @@
-from datetime import datetime
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
 
+from django.conf import settings
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
 
+from blog.thumbnails import variant_urls
 from core.models import BaseModel
 
 User = get_user_model()
@@ -39,12 +45,48 @@ class Category(BaseModel):
         return self.title
 
 
-class AddCommentsMixin():
-    def with_comments(self):
-        return self.get_queryset().annotate(comment_count=Count('comments'))
+def published_now():
+    """Текущее время, округлённое вниз до PUBLISHED_NOW_GRANULARITY.
 
+    В пределах интервала запросы лент получают одинаковые параметры
+    и могут разделять кэш.
+    """
+    now = timezone.now()
+    granularity = settings.PUBLISHED_NOW_GRANULARITY
+    if not granularity:
+        return now
+    return now - timedelta(
+        seconds=now.timestamp() % granularity)
 
-class PostDetailedQueryset(models.QuerySet):
+
+# Публикации, удаляемые прямо сейчас вместе со своими комментариями.
+deleting_posts = ContextVar('deleting_posts', default=frozenset())
+
+
+@contextmanager
+def posts_deleting(pks):
+    """Отмечает публикации как удаляемые на время удаления.
+
+    Сигналы комментариев не обновляют счётчики этих публикаций: при
+    каскадном удалении это был бы отдельный UPDATE на каждый комментарий.
+    """
+    token = deleting_posts.set(deleting_posts.get() | set(pks))
+    try:
+        yield
+    finally:
+        deleting_posts.reset(token)
+
+
+class PostQuerySet(models.QuerySet):
+    def delete(self):
+        with posts_deleting(self.values_list('pk', flat=True)):
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
+class PostDetailedQueryset(PostQuerySet):
     def detailed(self):
         return self.select_related(
             'location',
@@ -55,17 +97,17 @@ class PostDetailedQueryset(models.QuerySet):
 class PostPublishedQueryset(PostDetailedQueryset):
     def published(self):
         return self.detailed().filter(
-            pub_date__lte=datetime.now(),
+            pub_date__lte=published_now(),
             is_published=True,
             category__is_published=True)
 
 
-class PostDetailedManager(AddCommentsMixin, models.Manager):
+class PostDetailedManager(models.Manager):
     def get_queryset(self):
         return PostDetailedQueryset(self.model).detailed()
 
 
-class PostPublishedManager(AddCommentsMixin, models.Manager):
+class PostPublishedManager(models.Manager):
     def get_queryset(self):
         return PostPublishedQueryset(self.model).published()
 
@@ -98,17 +140,57 @@ class Post(BaseModel):
         verbose_name='Категория'
     )
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
-    objects = models.Manager()
+    has_thumbnails = models.BooleanField(
+        'Миниатюры созданы', default=False, editable=False)
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+    objects = PostQuerySet.as_manager()
     detailed = PostDetailedManager()
     published = PostPublishedManager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = (
+            # Общая лента, лента категории и лента автора; id — для курсора.
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=Q(is_published=True),
+                name='post_published_feed_idx'),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                condition=Q(is_published=True),
+                name='post_category_feed_idx'),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx'),
+        )
 
     def __str__(self):
         return self.title
 
+    def delete(self, *args, **kwargs):
+        with posts_deleting([self.pk]):
+            return super().delete(*args, **kwargs)
+
+    @property
+    def card_image(self):
+        if self.image and self.has_thumbnails:
+            return variant_urls(self.image, 'card')
+
+    @property
+    def detail_image(self):
+        if self.image and self.has_thumbnails:
+            return variant_urls(self.image, 'detail')
+
+    def is_visible(self):
+        # Те же условия, что и в PostPublishedQueryset.published().
+        return (self.is_published
+                and self.category is not None
+                and self.category.is_published
+                and self.pub_date <= published_now())
+
 
 class CommentQueryset(models.QuerySet):
     def with_author(self):
@@ -143,3 +225,12 @@ class Comment(models.Model):
 
     def __str__(self):
         return self.text
+
+
+def recount_comments(posts=None):
+    counts = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(count=Count('pk')).values('count')
+    if posts is None:
+        posts = Post.objects.all()
+    return posts.update(comment_count=Coalesce(Subquery(counts), 0))
@@ -0,0 +1,105 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections.abc import Sequence
+
+from django.db.models import Q
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(obj, field):
+    value = f'{getattr(obj, field).isoformat()}|{obj.pk}'
+    return urlsafe_b64encode(value.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, pk = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        value = parse_datetime(value)
+        pk = int(pk)
+    except (BinasciiError, UnicodeError, ValueError):
+        raise Http404('Неверный курсор страницы.')
+    if value is None:
+        raise Http404('Неверный курсор страницы.')
+    return value, pk
+
+
+class CursorPage(Sequence):
+    """Страница, заданная курсором (field, id) вместо номера."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, field, has_next, has_previous):
+        self.object_list = object_list
+        self.field = field
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    def has_other_pages(self):
+        return self.has_next_page or self.has_previous_page
+
+    @property
+    def next_cursor(self):
+        if self.has_next_page:
+            return encode_cursor(self.object_list[-1], self.field)
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous_page:
+            return encode_cursor(self.object_list[0], self.field)
+
+
+class CursorPaginator:
+    """Постраничный вывод без COUNT(*) и OFFSET.
+
+    Следующая страница выбирается условием по ключу (field, id)
+    относительно последней записи текущей, поэтому стоимость запроса
+    не зависит от глубины страницы.
+    """
+
+    def __init__(self, queryset, per_page, field='pub_date',
+                 descending=True):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+
+    def seek(self, cursor, backwards):
+        value, pk = decode_cursor(cursor)
+        lookup = 'lt' if self.descending != backwards else 'gt'
+        ordering = (self.field, 'pk')
+        if self.descending != backwards:
+            ordering = (f'-{self.field}', '-pk')
+        return self.queryset.filter(
+            Q(**{f'{self.field}__{lookup}': value})
+            | Q(**{self.field: value, f'pk__{lookup}': pk})
+        ).order_by(*ordering)
+
+    def page(self, after=None, before=None):
+        if before is not None:
+            object_list = list(self.seek(before, True)[:self.per_page + 1])
+            has_previous = len(object_list) > self.per_page
+            object_list = object_list[:self.per_page][::-1]
+            return CursorPage(object_list, self.field, True, has_previous)
+        if after is not None:
+            queryset = self.seek(after, False)
+        else:
+            prefix = '-' if self.descending else ''
+            queryset = self.queryset.order_by(
+                f'{prefix}{self.field}', f'{prefix}pk')
+        object_list = list(queryset[:self.per_page + 1])
+        has_next = len(object_list) > self.per_page
+        return CursorPage(object_list[:self.per_page], self.field,
+                          has_next, after is not None)
@@ -0,0 +1,90 @@
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_save)
+from django.dispatch import receiver
+
+from blog.cache import (
+    bump_feed_page_version, bump_post_card_version, delete_post_card)
+from blog.models import (
+    Category, Comment, Location, Post, User, deleting_posts)
+from core.jobs import enqueue
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw, **kwargs):
+    # При loaddata счётчики пересчитываются командой recount_comments.
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1)
+
+
+def post_is_deleting(comment):
+    return comment.post_id in deleting_posts.get()
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    # Счётчик удаляемой публикации обновлять незачем, см. posts_deleting.
+    # Каскады без этой отметки (например, при удалении автора) обновляют
+    # счётчик по одному комментарию.
+    if post_is_deleting(instance):
+        return
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1)
+
+
+@receiver(post_init, sender=Post)
+def remember_image(sender, instance, **kwargs):
+    # Значение берётся из __dict__, чтобы не загружать отложенное поле.
+    image = instance.__dict__.get('image')
+    instance._saved_image_name = getattr(image, 'name', image)
+
+
+@receiver(pre_save, sender=Post)
+def reset_thumbnails(sender, instance, **kwargs):
+    if ('image' in instance.__dict__
+            and instance.image.name != instance._saved_image_name):
+        instance.has_thumbnails = False
+
+
+@receiver(post_save, sender=Post)
+def process_image(sender, instance, raw, **kwargs):
+    instance._saved_image_name = instance.image.name
+    if raw or not instance.image or instance.has_thumbnails:
+        return
+    enqueue('blog.tasks.process_post_image', post_id=instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_feed_pages(sender, instance, **kwargs):
+    # Версию сменит post_delete самой публикации.
+    if sender is Comment and post_is_deleting(instance):
+        return
+    bump_feed_page_version()
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_post_card(sender, instance, **kwargs):
+    # Изменения самой публикации меняют updated_at, входящий в ключ.
+    delete_post_card(instance)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_post_cards(sender, **kwargs):
+    bump_post_card_version()
+    bump_feed_page_version()
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_post_cards(sender, update_fields, **kwargs):
+    # Вход пользователя сохраняет только last_login.
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_post_card_version()
+    bump_feed_page_version()
@@ -0,0 +1,39 @@
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+from blog.cache import bump_feed_page_version
+from blog.models import Post
+from blog.thumbnails import (
+    clean_content, hashed_name, load_image, save_variants)
+
+
+def process_post_image(post_id):
+    """Проверяет загруженное изображение, очищает его и создаёт миниатюры.
+
+    Очищенный оригинал сохраняется под именем из хэша содержимого.
+    Выполняется обработчиком очереди (manage.py run_jobs).
+    """
+    post = Post.objects.filter(pk=post_id).only('pk', 'image').first()
+    if post is None or not post.image:
+        return
+    # Пока задача ждала, изображение могли заменить новым.
+    same_image = Post.objects.filter(pk=post.pk, image=post.image.name)
+    source = load_image(post.image)
+    if source is None:
+        post.image.delete(save=False)
+        same_image.update(
+            image='', has_thumbnails=False, updated_at=timezone.now())
+        # update() не отправляет сигналов, сбрасывающих кэш лент.
+        bump_feed_page_version()
+        return
+    content = clean_content(source)
+    name = hashed_name(post.image.name, content)
+    storage = post.image.storage
+    if not storage.exists(name):
+        storage.save(name, ContentFile(content))
+    save_variants(storage, name, source)
+    if name != post.image.name:
+        storage.delete(post.image.name)
+    same_image.update(
+        image=name, has_thumbnails=True, updated_at=timezone.now())
+    bump_feed_page_version()
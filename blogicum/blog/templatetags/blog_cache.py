@@ -0,0 +1,23 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.cache import get_post_card, get_post_card_version, set_post_card
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    # Версию читаем из кэша один раз на запрос, а не на каждую карточку.
+    request = context.get('request')
+    version = getattr(request, '_post_card_version', None)
+    if version is None:
+        version = get_post_card_version()
+        if request is not None:
+            request._post_card_version = version
+    html = get_post_card(post, version)
+    if html is None:
+        html = context.template.engine.get_template(
+            'includes/post_card.html').render(context.new({'post': post}))
+        set_post_card(post, version, html)
+    return mark_safe(html)
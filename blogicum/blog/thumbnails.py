@@ -0,0 +1,88 @@
+import logging
+import os
+from collections import namedtuple
+from hashlib import sha256
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+HASH_LENGTH = 16
+
+ImageVariant = namedtuple('ImageVariant', ('webp', 'jpeg'))
+
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+
+
+def variant_name(name, variant, extension):
+    stem, _ = os.path.splitext(name)
+    return f'{stem}_{variant}.{extension}'
+
+
+def variant_urls(image, variant):
+    return ImageVariant(
+        webp=image.storage.url(variant_name(image.name, variant, 'webp')),
+        jpeg=image.storage.url(variant_name(image.name, variant, 'jpg')),
+    )
+
+
+def load_image(image):
+    """Проверяет и читает файл изображения, учитывая ориентацию из EXIF.
+
+    Возвращает None, если файл не является изображением.
+    """
+    try:
+        with image.open('rb'):
+            Image.open(image).verify()
+        with image.open('rb'):
+            source = Image.open(image)
+            source.load()
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.warning('Не удалось прочитать изображение %s', image.name)
+        return None
+    image_format = source.format
+    source = ImageOps.exif_transpose(source)
+    source.format = image_format
+    return source
+
+
+def replace_file(storage, name, content):
+    storage.delete(name)
+    storage.save(name, ContentFile(content))
+
+
+def clean_content(source):
+    """Кодирует изображение заново, без EXIF и других метаданных."""
+    content = BytesIO()
+    # Без info кодеки не переносят EXIF, ICC и текстовые блоки.
+    source.info = {}
+    options = {'quality': 95} if source.format == 'JPEG' else {}
+    source.save(content, source.format, **options)
+    return content.getvalue()
+
+
+def hashed_name(name, content):
+    """Имя файла по содержимому: такой URL можно кэшировать навсегда."""
+    directory, filename = os.path.split(name)
+    extension = os.path.splitext(filename)[1].lower()
+    digest = sha256(content).hexdigest()[:HASH_LENGTH]
+    return os.path.join(directory, f'{digest}{extension}')
+
+
+def save_variants(storage, name, source):
+    """Сохраняет рядом с оригиналом уменьшенные копии в WebP и JPEG."""
+    source = source.convert('RGB')
+    for variant, width in settings.POST_IMAGE_VARIANTS.items():
+        resized = source.copy()
+        resized.thumbnail((width, source.height), Image.Resampling.LANCZOS)
+        for extension, (image_format, options) in FORMATS.items():
+            content = BytesIO()
+            resized.save(content, image_format, **options)
+            replace_file(storage, variant_name(name, variant, extension),
+                         content.getvalue())
@@ -23,6 +23,9 @@ urlpatterns = [
     path('posts/<int:pk>/delete/',
          post_views.PostDeleteView.as_view(),
          name='delete_post'),
+    path('posts/<int:pk>/comments/',
+         comment_views.CommentListView.as_view(),
+         name='post_comments'),
     path('posts/<int:post_pk>/comment/',
          comment_views.CommentCreateView.as_view(),
          name='add_comment'),
@@ -1,7 +1,20 @@
 from django.urls import reverse_lazy
-from django.views.generic import CreateView, DeleteView, UpdateView
+from django.views.generic import (
+    CreateView, DeleteView, TemplateView, UpdateView
+)
 
-from blog.mixins import CommentAuthorizedMixin, CommentMixin
+from blog.mixins import (
+    CommentAuthorizedMixin, CommentMixin, PostCommentsMixin)
+
+
+class CommentListView(PostCommentsMixin, TemplateView):
+    template_name = 'includes/comment_list.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post'] = self.get_visible_post(self.kwargs['pk'])
+        context['comments'] = self.get_comments_page(context['post'])
+        return context
 
 
 class CommentCreateView(CommentMixin, CreateView):
@@ -7,31 +7,35 @@ from django.views.generic import (
 
 from blog.forms import CommentForm, PostForm
 from blog.mixins import (
-    PostModelMixin, PostRedirectToProfileMixin, PostRedirectToSelfMixin,
-    PostsUpdateMixin, PostRedirectToSelfMixin)
+    AnonymousFeedCacheMixin, CursorPaginationMixin, PostAuthorMixin,
+    PostCommentsMixin, PostModelMixin, PostRedirectToProfileMixin,
+    PostRedirectToSelfMixin, PostsUpdateMixin)
 from blog.models import Category, Post
 
 
-class PostListView(PostModelMixin, ListView):
-    queryset = Post.published.with_comments()
+class PostListView(AnonymousFeedCacheMixin, PostModelMixin,
+                   CursorPaginationMixin, ListView):
     template_name = 'blog/list.html'
     paginate_by = settings.POSTS_ON_PAGE
 
+    def get_queryset(self):
+        return Post.published.all()
+
+    def get_scheduled_posts(self):
+        return Post.objects.filter(
+            is_published=True, category__is_published=True)
+
 
-class PostDetailView(PostModelMixin, DetailView):
+class PostDetailView(PostModelMixin, PostCommentsMixin, DetailView):
     template_name = 'blog/detail.html'
 
     def get_object(self):
-        post_id = self.kwargs['pk']
-        author_id = get_object_or_404(Post, pk=post_id).author_id
-        if author_id == self.request.user.id:
-            return Post.detailed.get(pk=post_id)
-        return get_object_or_404(Post.published, pk=post_id)
+        return self.get_visible_post(self.kwargs['pk'])
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments(manager='detailed').all()
+        context['comments'] = self.get_comments_page(self.object)
         return context
 
 
@@ -42,27 +46,32 @@ class PostCreatelView(PostsUpdateMixin, PostRedirectToProfileMixin,
         return super().form_valid(form)
 
 
-class PostEditView(PostsUpdateMixin, PostRedirectToSelfMixin, UpdateView):
+class PostEditView(PostsUpdateMixin, PostAuthorMixin, PostRedirectToSelfMixin,
+                   UpdateView):
     def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
+        if not self.is_post_author():
             return redirect(self.link_to_post())
         return super().dispatch(request, *args, **kwargs)
 
 
-class PostDeleteView(PostsUpdateMixin, PostRedirectToProfileMixin, DeleteView):
+class PostDeleteView(PostsUpdateMixin, PostAuthorMixin,
+                     PostRedirectToProfileMixin, DeleteView):
+    def get_queryset(self):
+        return super().get_queryset().select_related('location')
+
     def dispatch(self, request, *args, **kwargs):
-        self.instance = self.get_object()
-        if self.instance.author != request.user:
+        if not self.is_post_author():
             raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['form'] = PostForm(instance=self.instance)
+        context['form'] = PostForm(instance=self.object)
         return context
 
 
-class CategoryListView(PostModelMixin, ListView):
+class CategoryListView(AnonymousFeedCacheMixin, PostModelMixin,
+                       CursorPaginationMixin, ListView):
     template_name = 'blog/category.html'
     paginate_by = settings.POSTS_ON_PAGE
 
@@ -72,8 +81,10 @@ class CategoryListView(PostModelMixin, ListView):
         return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
-        return self.category.posts(
-            manager='published').with_comments()
+        return self.category.posts(manager='published').all()
+
+    def get_scheduled_posts(self):
+        return self.category.posts.filter(is_published=True)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
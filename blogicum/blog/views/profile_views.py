@@ -5,10 +5,12 @@ from django.urls import reverse_lazy
 from django.views.generic import ListView, UpdateView
 
 from blog.forms import UserForm
+from blog.mixins import AnonymousFeedCacheMixin, CursorPaginationMixin
 from blog.models import Post, User
 
 
-class ProfileDetailView(ListView):
+class ProfileDetailView(AnonymousFeedCacheMixin, CursorPaginationMixin,
+                        ListView):
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = settings.POSTS_ON_PAGE
@@ -20,7 +22,11 @@ class ProfileDetailView(ListView):
     def get_queryset(self):
         manager = ('detailed' if self.profile == self.request.user else
                    'published')
-        return self.profile.posts(manager=manager).with_comments()
+        return self.profile.posts(manager=manager).all()
+
+    def get_scheduled_posts(self):
+        return self.profile.posts.filter(
+            is_published=True, category__is_published=True)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
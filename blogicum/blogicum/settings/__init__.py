@@ -0,0 +1,17 @@
+"""Профиль настроек выбирается переменной окружения BLOGICUM_ENV."""
+import os
+
+PROFILES = ('dev', 'prod')
+
+profile = os.environ.get('BLOGICUM_ENV', 'dev')
+
+if profile not in PROFILES:
+    from django.core.exceptions import ImproperlyConfigured
+
+    raise ImproperlyConfigured(
+        f'BLOGICUM_ENV должен быть одним из: {", ".join(PROFILES)}.')
+
+if profile == 'prod':
+    from .prod import *  # noqa: F401, F403
+else:
+    from .dev import *  # noqa: F401, F403
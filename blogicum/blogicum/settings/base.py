@@ -0,0 +1,256 @@
+"""
+Django settings for blogicum project.
+
+Generated by 'django-admin startproject' using Django 3.2.16.
+Общие настройки; профили dev и prod дополняют их.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/3.2/ref/settings/
+"""
+
+import os
+from pathlib import Path
+
+from .database import database_from_env, replicas_from_env
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+LOGIN_REDIRECT_URL = 'blog:index'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+MEDIA_URL = '/media/'
+
+# Как отдавать MEDIA_ROOT: 'django' (FileResponse), 'x-accel-redirect'
+# (nginx, internal location MEDIA_ACCEL_REDIRECT_PREFIX с alias на
+# MEDIA_ROOT) или 'x-sendfile' (Apache mod_xsendfile, lighttpd).
+MEDIA_SERVE_MODE = 'django'
+
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+# Cache-Control для файлов без хэша содержимого в имени, в секундах.
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static_dev',
+]
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-ifzy+u8%m*@#c+fyn2_je%1_ntj3a)+f^+h-+fr1p7f(=7yu7#',
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+# Профиль настроек, выбранный переменной окружения BLOGICUM_ENV.
+SETTINGS_PROFILE = None
+
+# Application definition
+
+INSTALLED_APPS = [
+    'core.apps.CoreConfig',
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'django_bootstrap5',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaPinningMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ProfilingMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware'
+]
+
+# Доля запросов, которые замеряет core.middleware.PerformanceMiddleware
+# (от 0 до 1); при 0 middleware отключается.
+PERF_SAMPLE_RATE = float(os.environ.get('PERF_SAMPLE_RATE', 0))
+
+# Профилирование отдельных запросов, см. core.profiling: каталог для
+# файлов, срок действия токена (с) и интервал сэмплера (с).
+PROFILE_DIR = BASE_DIR / 'profiles'
+PROFILE_TOKEN_MAX_AGE = 60 * 60
+PROFILE_SAMPLE_INTERVAL = 0.001
+
+# Токен для /metrics/ (заголовок Authorization: Bearer <токен>); без
+# токена метрики видят только сотрудники. Адрес клиента не проверяется:
+# за прокси все запросы приходят с 127.0.0.1.
+PERF_METRICS_TOKEN = os.environ.get('PERF_METRICS_TOKEN')
+
+# Запросы дольше порога в миллисекундах пишутся в SLOW_QUERY_LOG, отчёт —
+# manage.py slow_query_report. Пустое значение отключает журнал.
+SLOW_QUERY_THRESHOLD_MS = (
+    float(os.environ['SLOW_QUERY_THRESHOLD_MS'])
+    if os.environ.get('SLOW_QUERY_THRESHOLD_MS') else None)
+
+SLOW_QUERY_LOG = BASE_DIR / 'logs' / 'slow_queries.ndjson'
+
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+
+SLOW_QUERY_LOG_BACKUPS = 5
+
+POSTS_ON_PAGE = 10
+
+COMMENTS_ON_PAGE = 50
+
+# Шаг округления времени в фильтре опубликованных постов, в секундах:
+# отложенная публикация появляется в лентах не позже чем через этот шаг.
+PUBLISHED_NOW_GRANULARITY = 60
+
+# Ширина уменьшенных копий изображений публикаций, в пикселях.
+POST_IMAGE_VARIANTS = {
+    'card': 640,
+    'detail': 1280,
+}
+
+# Число попыток выполнения фоновой задачи (manage.py run_jobs).
+JOB_MAX_ATTEMPTS = 3
+
+# Через сколько секунд выполняющаяся задача считается брошенной
+# (обработчик завершился, не успев её закончить) и берётся заново.
+JOB_TIMEOUT = 60 * 10
+
+# Время жизни закэшированных карточек публикаций, в секундах.
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Предельное время жизни кэша лент для анонимных пользователей, в секундах.
+FEED_PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Курсорная пагинация лент по (pub_date, id) вместо ?page=N.
+POSTS_CURSOR_PAGINATION = False
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/3.2/ref/settings/#databases
+
+DATABASES = {
+    'default': database_from_env(f'sqlite:///{BASE_DIR / "db.sqlite3"}'),
+    **replicas_from_env(),
+}
+
+# Чтение в запросах идёт в реплики, запись — в default, см. core.routers.
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Сколько секунд после записи чтение пользователя идёт из default,
+# чтобы он видел свои изменения несмотря на отставание реплик.
+REPLICA_PIN_SECONDS = 10
+
+# PRAGMA для каждого нового соединения SQLite, см. core.db. В режиме WAL
+# чтение не ждёт записи, а запись ждёт освобождения базы до busy_timeout
+# миллисекунд вместо ошибки "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение задаёт размер в КиБ, а не в страницах.
+    'cache_size': -64 * 1024,
+    'temp_store': 'memory',
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/3.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/3.2/howto/static-files/
+
+STATIC_URL = '/static/'
+
+# Каталог, куда collectstatic собирает статику для веб-сервера.
+STATIC_ROOT = BASE_DIR / 'static'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,46 @@
+import os
+from copy import deepcopy
+
+from .base import *  # noqa: F401, F403
+from .base import BASE_DIR, TEMPLATES
+from .database import database_from_env, replicas_from_env
+
+SETTINGS_PROFILE = 'prod'
+
+DEBUG = False
+
+# Без DJANGO_SECRET_KEY остаётся ключ django-insecure-… из base.py,
+# и запуск останавливает core.apps.check_production_secret_key.
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',')
+    if host.strip()
+]
+
+# Соединение с базой переиспользуется между запросами.
+DATABASES = {
+    'default': database_from_env(
+        f'sqlite:///{BASE_DIR / "db.sqlite3"}', conn_max_age=60),
+    **replicas_from_env(conn_max_age=60),
+}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+# Шаблоны компилируются один раз на процесс.
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Имена с хэшем содержимого из манифеста и заранее сжатые копии;
+# Bootstrap попадает в сборку после manage.py vendor_bootstrap.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+# Журнал медленных запросов включён по умолчанию, см. core.slowlog.
+SLOW_QUERY_THRESHOLD_MS = float(
+    os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
@@ -1,6 +1,36 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+
+        from core.db import (
+            check_connections, configure_sqlite, install_slow_query_log)
+
+        check_production_debug()
+        check_production_secret_key()
+        request_started.connect(check_connections)
+        connection_created.connect(configure_sqlite)
+        connection_created.connect(install_slow_query_log)
+
+
+def check_production_debug():
+    """Не даёт запустить production-профиль с включённым DEBUG."""
+    if settings.SETTINGS_PROFILE == 'prod' and settings.DEBUG:
+        raise ImproperlyConfigured(
+            'DEBUG нельзя включать в профиле prod (BLOGICUM_ENV=prod).')
+
+
+def check_production_secret_key():
+    """Не даёт запустить production-профиль с ключом из репозитория."""
+    if (settings.SETTINGS_PROFILE == 'prod'
+            and settings.SECRET_KEY.startswith('django-insecure-')):
+        raise ImproperlyConfigured(
+            'В профиле prod задайте DJANGO_SECRET_KEY.')
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import connections
+
+from core.slowlog import slow_query_wrapper
+
+
+def check_connections(**kwargs):
+    """Закрывает постоянные соединения, оборвавшиеся между запросами.
+
+    Включается CONN_HEALTH_CHECKS в настройках базы, как в Django 4.1:
+    без проверки первый запрос после перезапуска базы или pgbouncer
+    завершился бы ошибкой.
+    """
+    for connection in connections.all():
+        if (connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and connection.connection is not None
+                and not connection.in_atomic_block
+                and not connection.is_usable()):
+            connection.close()
+
+
+def apply_sqlite_pragmas(db, pragmas):
+    for name, value in pragmas.items():
+        db.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Применяет SQLITE_PRAGMAS к каждому новому соединению SQLite."""
+    if connection.vendor == 'sqlite':
+        apply_sqlite_pragmas(connection.connection, settings.SQLITE_PRAGMAS)
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    """Ставит slow_query_wrapper на соединение один раз за его жизнь.
+
+    Обёртка встаёт в начало списка: соединение может открыться внутри
+    connection.execute_wrapper(), который при выходе снимает последнюю.
+    """
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, slow_query_wrapper)
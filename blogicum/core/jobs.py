@@ -0,0 +1,65 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(task, **payload):
+    """Ставит в очередь вызов функции task (путь для import_string)."""
+    return Job.objects.create(task=task, payload=payload)
+
+
+def claim_job():
+    """Берёт задачу из очереди или зависшую у погибшего обработчика.
+
+    Задача в статусе RUNNING дольше JOB_TIMEOUT секунд считается
+    брошенной: она выполняется заново, пока не кончатся попытки.
+    """
+    now = timezone.now()
+    stale = Q(status=Job.RUNNING,
+              started_at__lt=now - timedelta(seconds=settings.JOB_TIMEOUT))
+    jobs = Job.objects.filter(Q(status=Job.PENDING) | stale).order_by('pk')
+    for job in jobs[:10]:
+        # Условный UPDATE не даёт двум обработчикам взять одну задачу.
+        same_state = Job.objects.filter(
+            pk=job.pk, status=job.status, started_at=job.started_at)
+        if (job.status == Job.RUNNING
+                and job.attempts >= settings.JOB_MAX_ATTEMPTS):
+            same_state.update(
+                status=Job.FAILED, finished_at=now,
+                error='Обработчик не завершил задачу за JOB_TIMEOUT.')
+            continue
+        claimed = same_state.update(
+            status=Job.RUNNING,
+            started_at=now,
+            attempts=F('attempts') + 1)
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_job(job):
+    try:
+        import_string(job.task)(**job.payload)
+    except Exception:
+        logger.exception('Задача %s завершилась с ошибкой', job.pk)
+        job.error = traceback.format_exc()
+        if job.attempts < settings.JOB_MAX_ATTEMPTS:
+            job.status = Job.PENDING
+        else:
+            job.status = Job.FAILED
+    else:
+        job.status = Job.DONE
+        job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=('status', 'error', 'finished_at'))
+    return job.status == Job.DONE
@@ -0,0 +1,190 @@
+"""Воспроизведение записанного трафика для нагрузочных тестов.
+
+Журнал — NDJSON, по строке на запрос:
+{"method": "POST", "path": "/posts/1/comment/", "user": "name",
+ "data": {"text": "..."}}. Поля user и data необязательны.
+"""
+import statistics
+import threading
+import time
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urljoin
+from urllib.request import (
+    HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener)
+
+from django.test import Client
+from django.urls import Resolver404, resolve, reverse
+
+# Верхние границы интервалов гистограммы задержек, в миллисекундах.
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LoginError(Exception):
+    pass
+
+
+class Session:
+    """Клиент одного пользователя: cookies, вход и токен CSRF."""
+
+    def login(self, username, password):
+        url = reverse('login')
+        self.request('GET', url)
+        status = self.request('POST', url, {
+            'username': username, 'password': password})
+        if status != 302:
+            raise LoginError(f'Не удалось войти как {username}.')
+
+    def request(self, method, path, data=None):
+        if method == 'POST':
+            data = {**(data or {}),
+                    'csrfmiddlewaretoken': self.cookie('csrftoken')}
+        return self.send(method, path, data)
+
+
+class ClientSession(Session):
+    """Запросы через обработчик Django в этом же процессе."""
+
+    def __init__(self, host):
+        self.client = Client(
+            enforce_csrf_checks=True, raise_request_exception=False,
+            HTTP_HOST=host)
+
+    def cookie(self, name):
+        morsel = self.client.cookies.get(name)
+        return morsel.value if morsel else ''
+
+    def send(self, method, path, data):
+        if method == 'POST':
+            return self.client.post(path, data).status_code
+        return self.client.generic(method, path).status_code
+
+
+class NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpSession(Session):
+    """Запросы по HTTP к запущенному серверу (WSGI или ASGI)."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.cookies = CookieJar()
+        self.opener = build_opener(
+            HTTPCookieProcessor(self.cookies), NoRedirect)
+
+    def cookie(self, name):
+        for cookie in self.cookies:
+            if cookie.name == name:
+                return cookie.value
+        return ''
+
+    def send(self, method, path, data):
+        url = urljoin(self.base_url, path)
+        body = urlencode(data).encode() if data is not None else None
+        request = Request(url, data=body, method=method, headers={
+            'Referer': url})
+        try:
+            with self.opener.open(request, timeout=30) as response:
+                response.read()
+                return response.status
+        except HTTPError as error:
+            return error.code
+
+
+def view_name(path):
+    try:
+        return resolve(path.split('?')[0]).view_name
+    except Resolver404:
+        return 'unresolved'
+
+
+class Stats:
+    """Задержки и ошибки по именам маршрутов; общий для всех потоков."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, name, seconds, ok):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(seconds * 1000)
+            self.errors[name] = self.errors.get(name, 0) + (not ok)
+
+    def report(self, elapsed):
+        report = {}
+        for name, latencies in sorted(self.latencies.items()):
+            latencies.sort()
+            histogram = {}
+            for bound in LATENCY_BUCKETS + (float('inf'),):
+                histogram[f'le_{bound}'] = sum(
+                    latency <= bound for latency in latencies)
+            report[name] = {
+                'requests': len(latencies),
+                'errors': self.errors[name],
+                'error_rate': self.errors[name] / len(latencies),
+                'rps': len(latencies) / elapsed,
+                'p50_ms': statistics.median(latencies),
+                'p95_ms': latencies[int(len(latencies) * 0.95)],
+                'p99_ms': latencies[int(len(latencies) * 0.99)],
+                'max_ms': latencies[-1],
+                'histogram': histogram,
+            }
+        return report
+
+
+class Replay:
+    """Раздаёт записи журнала потокам; у каждого потока свои сессии."""
+
+    def __init__(self, entries, make_session, password, stats):
+        self.entries = iter(entries)
+        self.lock = threading.Lock()
+        self.make_session = make_session
+        self.password = password
+        self.stats = stats
+        self.failure = None
+
+    def next_entry(self):
+        with self.lock:
+            if self.failure is not None:
+                return None
+            return next(self.entries, None)
+
+    def worker(self):
+        sessions = {}
+        try:
+            while (entry := self.next_entry()) is not None:
+                user = entry.get('user')
+                if user not in sessions:
+                    sessions[user] = self.make_session()
+                    if user:
+                        sessions[user].login(user, self.password)
+                self.send(sessions[user], entry)
+        except Exception as error:
+            with self.lock:
+                self.failure = error
+
+    def send(self, session, entry):
+        method = entry.get('method', 'GET').upper()
+        start = time.perf_counter()
+        try:
+            status = session.request(method, entry['path'], entry.get('data'))
+        except OSError:
+            status = None
+        elapsed = time.perf_counter() - start
+        self.stats.add(view_name(entry['path']), elapsed,
+                       status is not None and status < 400)
+
+    def run(self, concurrency):
+        threads = [threading.Thread(target=self.worker)
+                   for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.failure is not None:
+            raise self.failure
+        return time.perf_counter() - start
@@ -0,0 +1,114 @@
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.db import apply_sqlite_pragmas
+
+
+class Worker(threading.Thread):
+    def __init__(self, path, pragmas, deadline, action):
+        super().__init__()
+        self.path = path
+        self.pragmas = pragmas
+        self.deadline = deadline
+        self.action = action
+        self.timings = []
+        self.errors = 0
+
+    def run(self):
+        db = sqlite3.connect(self.path, isolation_level=None, timeout=0)
+        apply_sqlite_pragmas(db, self.pragmas)
+        while time.perf_counter() < self.deadline:
+            start = time.perf_counter()
+            try:
+                self.action(db)
+            except sqlite3.OperationalError:
+                self.errors += 1
+                if db.in_transaction:
+                    db.execute('ROLLBACK')
+            else:
+                self.timings.append(time.perf_counter() - start)
+        db.close()
+
+
+def read(db):
+    db.execute('SELECT count(*), max(id) FROM comment').fetchone()
+
+
+def write(hold):
+    def action(db):
+        db.execute('BEGIN IMMEDIATE')
+        db.execute("INSERT INTO comment (text) VALUES ('bench')")
+        # Работа внутри транзакции: сигналы, обновление счётчиков.
+        time.sleep(hold)
+        db.execute('COMMIT')
+    return action
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест SQLite: параллельные чтения и записи в '
+            'журнале по умолчанию и с SQLITE_PRAGMAS.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument(
+            '--duration', type=float, default=3,
+            help='Длительность каждого прогона, в секундах.')
+        parser.add_argument(
+            '--hold', type=float, default=0.005,
+            help='Время внутри пишущей транзакции, в секундах.')
+
+    def handle(self, *args, **options):
+        busy_timeout = settings.SQLITE_PRAGMAS.get('busy_timeout', 5000)
+        modes = (
+            ('rollback journal', {'busy_timeout': busy_timeout}),
+            ('SQLITE_PRAGMAS', settings.SQLITE_PRAGMAS),
+        )
+        for name, pragmas in modes:
+            readers, writers = self.run(pragmas, options)
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.report('read', readers, options['duration'])
+            self.report('write', writers, options['duration'])
+
+    def run(self, pragmas, options):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'bench.sqlite3'
+            db = sqlite3.connect(path)
+            apply_sqlite_pragmas(db, pragmas)
+            db.execute(
+                'CREATE TABLE comment (id INTEGER PRIMARY KEY, text TEXT)')
+            db.executemany(
+                'INSERT INTO comment (text) VALUES (?)',
+                (('bench',) for _ in range(10000)))
+            db.commit()
+            db.close()
+            deadline = time.perf_counter() + options['duration']
+            readers = [Worker(path, pragmas, deadline, read)
+                       for _ in range(options['readers'])]
+            writers = [Worker(path, pragmas, deadline,
+                              write(options['hold']))
+                       for _ in range(options['writers'])]
+            for worker in readers + writers:
+                worker.start()
+            for worker in readers + writers:
+                worker.join()
+        return readers, writers
+
+    def report(self, name, workers, duration):
+        timings = sorted(t * 1000 for w in workers for t in w.timings)
+        errors = sum(w.errors for w in workers)
+        if not timings:
+            self.stdout.write(f'{name}: 0 ok, {errors} errors')
+            return
+        self.stdout.write(
+            f'{name}: {len(timings) / duration:.0f}/s, '
+            f'p50 {statistics.median(timings):.2f} ms, '
+            f'p99 {timings[int(len(timings) * 0.99)]:.2f} ms, '
+            f'max {timings[-1]:.2f} ms, {errors} errors')
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.profiling import PROFILERS, make_token
+
+
+class Command(BaseCommand):
+    help = ('Выдаёт подписанный токен для профилирования запросов '
+            'сотрудника (core.middleware.ProfilingMiddleware).')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', choices=sorted(PROFILERS), default='sample',
+            help='cprofile — файл .prof, sample — стеки для flamegraph.')
+
+    def handle(self, *args, **options):
+        token = make_token(options['mode'])
+        minutes = settings.PROFILE_TOKEN_MAX_AGE // 60
+        self.stdout.write(token)
+        self.stderr.write(
+            f'Действует {minutes} мин. Передайте в ?_profile={token} '
+            f'или в заголовке X-Profile; файлы — в {settings.PROFILE_DIR}.')
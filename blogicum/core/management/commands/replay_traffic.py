@@ -0,0 +1,147 @@
+import json
+import random
+from functools import partial
+from itertools import chain, repeat
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Category, Location, Post, User
+from core.loadtest import (
+    ClientSession, HttpSession, LoginError, Replay, Stats)
+
+# Доли маршрутов в журнале, который создаёт --make-log.
+TRAFFIC_MIX = (
+    ('index', 40),
+    ('post_detail', 25),
+    ('category_posts', 10),
+    ('profile', 10),
+    ('post_comments', 5),
+    ('add_comment', 7),
+    ('create_post', 3),
+)
+
+
+class Command(BaseCommand):
+    help = ('Воспроизводит журнал запросов (NDJSON) с заданной '
+            'параллельностью через тестовый клиент или по HTTP и '
+            'показывает пропускную способность, задержки и ошибки по '
+            'маршрутам.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('log')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument(
+            '--target', default='client',
+            help='client — обработчик Django в этом процессе, либо адрес '
+                 'запущенного сервера, например http://127.0.0.1:8000.')
+        parser.add_argument(
+            '--password', default='',
+            help='Пароль пользователей из журнала (см. generate_blog_data '
+                 '--password).')
+        parser.add_argument(
+            '--host', default='localhost',
+            help='Заголовок Host для тестового клиента.')
+        parser.add_argument('--repeat', type=int, default=1)
+        parser.add_argument('--output', help='Файл для JSON-отчёта.')
+        parser.add_argument(
+            '--make-log', type=int, metavar='N',
+            help='Не воспроизводить, а записать в log N запросов по '
+                 'данным из базы.')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options['make_log']:
+            self.make_log(options['log'], options['make_log'], options['seed'])
+            return
+        with open(options['log'], encoding='utf-8') as log:
+            entries = [json.loads(line) for line in log if line.strip()]
+        if options['target'] == 'client':
+            if settings.DEBUG:
+                self.stderr.write(
+                    'DEBUG включён: панель отладки и журнал SQL искажают '
+                    'замеры, запускайте с BLOGICUM_ENV=prod.')
+            make_session = partial(ClientSession, options['host'])
+        else:
+            make_session = partial(HttpSession, options['target'])
+        stats = Stats()
+        replay = Replay(
+            chain.from_iterable(repeat(entries, options['repeat'])),
+            make_session, options['password'], stats)
+        try:
+            elapsed = replay.run(options['concurrency'])
+        except LoginError as error:
+            raise CommandError(error)
+        report = stats.report(elapsed)
+        total = sum(route['requests'] for route in report.values())
+        self.stdout.write(
+            f'{total} запросов за {elapsed:.1f} с, '
+            f'{total / elapsed:.1f} запросов/с, '
+            f'параллельность {options["concurrency"]}')
+        for name, route in report.items():
+            self.stdout.write(
+                f'{name}: {route["requests"]} ({route["rps"]:.1f}/с), '
+                f'p50 {route["p50_ms"]:.1f} ms, '
+                f'p95 {route["p95_ms"]:.1f} ms, '
+                f'p99 {route["p99_ms"]:.1f} ms, '
+                f'ошибок {route["error_rate"]:.1%}')
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({
+                    'target': options['target'],
+                    'concurrency': options['concurrency'],
+                    'elapsed': elapsed,
+                    'routes': report,
+                }, output, indent=2, ensure_ascii=False)
+
+    def make_log(self, path, count, seed):
+        rng = random.Random(seed)
+        posts = list(Post.published.order_by('-pub_date').values_list(
+            'pk', 'author__username', 'category__slug')[:1000])
+        users = list(User.objects.filter(is_active=True).order_by(
+            'pk').values_list('username', flat=True)[:100])
+        categories = list(Category.objects.filter(
+            is_published=True).values_list('pk', flat=True))
+        locations = list(Location.objects.filter(
+            is_published=True).values_list('pk', flat=True))
+        if not (posts and users and categories and locations):
+            raise CommandError(
+                'Для журнала нужны публикации, пользователи, категории и '
+                'местоположения, см. generate_blog_data.')
+        names, weights = zip(*TRAFFIC_MIX)
+        with open(path, 'w', encoding='utf-8') as log:
+            for name in rng.choices(names, weights, k=count):
+                post, author, category = rng.choice(posts)
+                entry = {'method': 'GET'}
+                if name == 'index':
+                    entry['path'] = reverse('blog:index')
+                elif name == 'post_detail':
+                    entry['path'] = reverse('blog:post_detail', args=[post])
+                elif name == 'category_posts':
+                    entry['path'] = reverse(
+                        'blog:category_posts', args=[category])
+                elif name == 'profile':
+                    entry['path'] = reverse('blog:profile', args=[author])
+                elif name == 'post_comments':
+                    entry['path'] = reverse(
+                        'blog:post_comments', args=[post])
+                elif name == 'add_comment':
+                    entry.update(
+                        method='POST', user=rng.choice(users),
+                        path=reverse('blog:add_comment', args=[post]),
+                        data={'text': 'Комментарий нагрузочного теста'})
+                else:
+                    entry.update(
+                        method='POST', user=rng.choice(users),
+                        path=reverse('blog:create_post'),
+                        data={
+                            'title': 'Публикация нагрузочного теста',
+                            'text': 'Текст',
+                            'pub_date': timezone.now().strftime('%Y-%m-%d'),
+                            'category': rng.choice(categories),
+                            'location': rng.choice(locations),
+                        })
+                log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.stdout.write(f'Записано запросов: {count}')
@@ -0,0 +1,116 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+ORDERINGS = {
+    'total': lambda query: query['total_ms'],
+    'count': lambda query: query['count'],
+    'max': lambda query: query['max_ms'],
+}
+
+
+def log_files(path):
+    """Текущий журнал и его ротированные копии, от старых к новым."""
+    backups = sorted(
+        path.parent.glob(f'{path.name}.*'),
+        key=lambda backup: int(backup.suffix[1:])
+        if backup.suffix[1:].isdigit() else 0,
+        reverse=True)
+    return [*backups, path] if path.exists() else backups
+
+
+class Command(BaseCommand):
+    help = ('Сводка журнала медленных SQL-запросов: самые затратные '
+            'запросы с числом вызовов, временем и представлениями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log', type=Path, default=None,
+            help='Путь к журналу; по умолчанию SLOW_QUERY_LOG.')
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument(
+            '--order', choices=sorted(ORDERINGS), default='total')
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        path = options['log'] or Path(settings.SLOW_QUERY_LOG)
+        files = log_files(path)
+        if not files:
+            raise CommandError(f'Журнал {path} не найден.')
+        queries, malformed = self.read(files)
+        top = sorted(queries.values(), key=ORDERINGS[options['order']],
+                     reverse=True)[:options['top']]
+        for query in top:
+            durations = sorted(query.pop('durations'))
+            query['mean_ms'] = query['total_ms'] / query['count']
+            query['p95_ms'] = durations[int(len(durations) * 0.95)]
+            query['params'] = len(query['params'])
+            query['origins'] = dict(query['origins'].most_common(3))
+        skipped = f'Пропущено повреждённых строк: {malformed}'
+        if options['json']:
+            if malformed:
+                self.stderr.write(skipped)
+            self.stdout.write(json.dumps(top, indent=2, ensure_ascii=False))
+            return
+        if malformed:
+            self.stdout.write(self.style.WARNING(skipped))
+        self.write_report(top)
+
+    def read(self, files):
+        """Сводка по запросам и число строк, которые не удалось разобрать.
+
+        Строка, оборванная при аварийной остановке, не мешает отчёту.
+        """
+        queries = {}
+        malformed = 0
+        for log_file in files:
+            with log_file.open(encoding='utf-8', errors='replace') as log:
+                for line in log:
+                    if not line.strip():
+                        continue
+                    try:
+                        self.add(queries, json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        malformed += 1
+        return queries, malformed
+
+    def write_report(self, top):
+        for number, query in enumerate(top, start=1):
+            origins = ', '.join(
+                f'{origin} ({count})'
+                for origin, count in query['origins'].items())
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{number}. {query["count"]} раз, всего '
+                f'{query["total_ms"]:.0f} ms, среднее '
+                f'{query["mean_ms"]:.1f} ms, p95 {query["p95_ms"]:.1f} ms, '
+                f'max {query["max_ms"]:.1f} ms, '
+                f'разных параметров {query["params"]}'))
+            self.stdout.write(f'   {origins}')
+            self.stdout.write(f'   {query["sql"]}')
+
+    @staticmethod
+    def add(queries, record):
+        # Поля читаются до изменения сводки: неполная запись её не портит.
+        sql, duration = record['sql'], float(record['duration_ms'])
+        params, origin = record['params'], record['origin']
+        rows = int(record['rows'] or 0)
+        query = queries.setdefault(sql, {
+            'sql': sql,
+            'count': 0,
+            'total_ms': 0,
+            'max_ms': 0,
+            'rows': 0,
+            'durations': [],
+            'params': set(),
+            'origins': Counter(),
+        })
+        query['count'] += 1
+        query['total_ms'] += duration
+        query['max_ms'] = max(query['max_ms'], duration)
+        query['rows'] += rows
+        query['durations'].append(duration)
+        query['params'].add(params)
+        query['origins'][origin] += 1
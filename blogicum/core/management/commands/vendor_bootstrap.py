@@ -0,0 +1,35 @@
+import hashlib
+from base64 import b64encode
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.storage import BOOTSTRAP_CSS_PATH
+
+# Та же версия и контрольная сумма, что у django_bootstrap5 по умолчанию.
+BOOTSTRAP_CSS_URL = (
+    'https://cdn.jsdelivr.net/npm/bootstrap@5.2.0/dist/css/bootstrap.min.css')
+BOOTSTRAP_CSS_INTEGRITY = (
+    'sha384-gH2yIJqKdNHPEq0n4Mqa/HGKIhSkIHeL5AyhkYV8i59U5AR6csBvApHHNl/vI1Bx')
+
+
+def integrity(content):
+    return 'sha384-' + b64encode(hashlib.sha384(content).digest()).decode()
+
+
+class Command(BaseCommand):
+    help = ('Скачивает Bootstrap в static_dev, чтобы он собирался '
+            'collectstatic вместе с остальной статикой.')
+
+    def handle(self, *args, **options):
+        with urlopen(BOOTSTRAP_CSS_URL, timeout=30) as response:
+            content = response.read()
+        if integrity(content) != BOOTSTRAP_CSS_INTEGRITY:
+            raise CommandError(
+                f'Контрольная сумма {BOOTSTRAP_CSS_URL} не совпадает.')
+        path = Path(settings.STATICFILES_DIRS[0]) / BOOTSTRAP_CSS_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        self.stdout.write(f'Сохранён {path}')
@@ -0,0 +1,62 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+
+from django.core.management.base import BaseCommand, CommandError
+
+DATABASE_NAME = 'blogicum'
+
+
+class Command(BaseCommand):
+    help = ('Запускает команду с DATABASE_URL, указывающим на временный '
+            'кластер PostgreSQL (нужны initdb и pg_ctl, Docker не нужен). '
+            'Пример: manage.py with_temp_postgres -- python -m pytest')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bindir', default=os.environ.get('PG_BINDIR'),
+            help='Каталог с initdb и pg_ctl, если их нет в PATH.')
+        parser.add_argument('command', nargs='+')
+
+    def handle(self, *args, **options):
+        bindir = options['bindir']
+        initdb = shutil.which('initdb', path=bindir)
+        pg_ctl = shutil.which('pg_ctl', path=bindir)
+        if initdb is None or pg_ctl is None:
+            raise CommandError('Не найдены initdb и pg_ctl, укажите --bindir.')
+        root = Path(tempfile.mkdtemp(prefix='blogicum-pg-'))
+        data = root / 'data'
+        try:
+            subprocess.run(
+                [initdb, '-D', data, '-U', 'postgres', '-A', 'trust',
+                 '--no-sync'],
+                check=True, stdout=subprocess.DEVNULL)
+            # Только unix-сокет и без fsync: кластер живёт до конца команды.
+            subprocess.run(
+                [pg_ctl, '-D', data, '-l', root / 'postgres.log', '-w',
+                 '-o', f"-k {root} -c listen_addresses='' -F", 'start'],
+                check=True, stdout=subprocess.DEVNULL)
+            try:
+                subprocess.run(
+                    [shutil.which('createdb', path=bindir) or 'createdb',
+                     '-h', root, '-U', 'postgres', DATABASE_NAME],
+                    check=True)
+                url = (f'postgres://postgres@{quote(str(root), safe="")}'
+                       f'/{DATABASE_NAME}')
+                self.stderr.write(f'DATABASE_URL={url}')
+                returncode = subprocess.run(
+                    options['command'],
+                    env={**os.environ, 'DATABASE_URL': url}).returncode
+            finally:
+                subprocess.run(
+                    [pg_ctl, '-D', data, '-m', 'immediate', 'stop'],
+                    stdout=subprocess.DEVNULL)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+        if returncode:
+            raise CommandError(
+                f'Команда завершилась с кодом {returncode}.',
+                returncode=returncode)
@@ -0,0 +1,104 @@
+"""Гистограммы производительности в текстовом формате Prometheus.
+
+Значения хранятся в памяти процесса: при нескольких рабочих процессах
+каждый отдаёт на /metrics/ свои.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class QueryTimer:
+    """Обёртка для connection.execute_wrapper: число и время запросов."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        # view -> [счётчики по интервалам..., +Inf], сумма.
+        self.series = {}
+
+    def observe(self, view, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.series.get(
+                view, ([0] * (len(self.buckets) + 1), 0))
+            counts[index] += 1
+            self.series[view] = counts, total + value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}',
+                 f'# TYPE {self.name} histogram']
+        with self.lock:
+            series = sorted(
+                (view, list(counts), total)
+                for view, (counts, total) in self.series.items())
+        for view, counts, total in series:
+            label = view.replace('\\', '\\\\').replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{view="{label}",le="{bound}"}} '
+                    f'{cumulative}')
+            lines.append(f'{self.name}_sum{{view="{label}"}} {total}')
+            lines.append(f'{self.name}_count{{view="{label}"}} {cumulative}')
+        return '\n'.join(lines)
+
+
+REQUEST_DURATION = Histogram(
+    'blogicum_request_duration_seconds',
+    'Время обработки запроса.', DURATION_BUCKETS)
+DB_DURATION = Histogram(
+    'blogicum_db_duration_seconds',
+    'Суммарное время SQL-запросов за запрос.', DURATION_BUCKETS)
+DB_QUERIES = Histogram(
+    'blogicum_db_queries',
+    'Число SQL-запросов за запрос.', QUERY_COUNT_BUCKETS)
+TEMPLATE_DURATION = Histogram(
+    'blogicum_template_render_seconds',
+    'Время отрисовки TemplateResponse.', DURATION_BUCKETS)
+RESPONSE_SIZE = Histogram(
+    'blogicum_response_size_bytes',
+    'Размер тела ответа.', SIZE_BUCKETS)
+
+HISTOGRAMS = (
+    REQUEST_DURATION, DB_DURATION, DB_QUERIES, TEMPLATE_DURATION,
+    RESPONSE_SIZE)
+
+
+def render_metrics():
+    return '\n'.join(histogram.render() for histogram in HISTOGRAMS) + '\n'
+
+
+def render_timed(request, response):
+    """Отрисовывает TemplateResponse внутри представления.
+
+    PerformanceMiddleware засекает отрисовку после представления, поэтому
+    время ранней отрисовки (например, перед записью в кэш) учитывается здесь.
+    """
+    start = time.perf_counter()
+    response.render()
+    timing = getattr(request, 'perf_timing', None)
+    if timing is not None:
+        timing['render'] = time.perf_counter() - start
+    return response
@@ -0,0 +1,134 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from core import metrics, profiling
+from core.routers import ReplicaState, request_state
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaPinningMiddleware:
+    """Выбирает реплику для чтения на время запроса.
+
+    После записи ставит cookie на REPLICA_PIN_SECONDS: пока она есть,
+    запросы пользователя читают из default и видят его изменения.
+    """
+
+    cookie_name = 'pin_primary'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas:
+            return self.get_response(request)
+        state = ReplicaState(
+            replica=random.choice(replicas),
+            pinned=(request.method not in SAFE_METHODS
+                    or self.cookie_name in request.COOKIES),
+        )
+        token = request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_state.reset(token)
+        if state.wrote:
+            response.set_cookie(
+                self.cookie_name, '1',
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True, samesite='Lax')
+        return response
+
+
+class PerformanceMiddleware:
+    """Замеры запроса: SQL, отрисовка шаблона, размер ответа.
+
+    Замеряется доля PERF_SAMPLE_RATE запросов; при 0 middleware не
+    подключается вовсе. Результат попадает в заголовок Server-Timing
+    и в гистограммы core.metrics. Должен стоять первым в MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERF_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PERF_SAMPLE_RATE
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        timer = metrics.QueryTimer()
+        request.perf_timing = timing = {}
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        metrics.REQUEST_DURATION.observe(view, total)
+        metrics.DB_DURATION.observe(view, timer.seconds)
+        metrics.DB_QUERIES.observe(view, timer.count)
+        server_timing = [
+            f'db;dur={timer.seconds * 1000:.1f};desc="{timer.count} queries"']
+        if 'render' in timing:
+            metrics.TEMPLATE_DURATION.observe(view, timing['render'])
+            server_timing.append(f'tpl;dur={timing["render"] * 1000:.1f}')
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(view, len(response.content))
+        server_timing.append(f'total;dur={total * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(server_timing)
+        return response
+
+    def process_template_response(self, request, response):
+        timing = getattr(request, 'perf_timing', None)
+        # Отрисованный в представлении ответ учтён metrics.render_timed.
+        if timing is not None and not response.is_rendered:
+            # Вызывается последним перед отрисовкой, так как middleware
+            # стоит первым в списке.
+            started = time.perf_counter()
+
+            def rendered(response):
+                timing['render'] = time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class ProfilingMiddleware:
+    """Профилирует запрос сотрудника с подписанным токеном.
+
+    Токен (команда profile_token) передаётся в параметре _profile или
+    заголовке X-Profile; остальные запросы проходят без изменений.
+    Имя сохранённого файла возвращается в заголовке X-Profile.
+    Должен стоять после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = (request.GET.get('_profile')
+                 or request.headers.get('X-Profile'))
+        mode = token and profiling.read_token(token)
+        if not mode or not request.user.is_staff:
+            return self.get_response(request)
+        profiler = profiling.PROFILERS[mode]()
+        profiler.start()
+        try:
+            response = self.get_response(request)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+        finally:
+            profiler.stop()
+        path = profiling.profile_path(request, profiler)
+        profiler.save(path)
+        response['X-Profile'] = path.name
+        return response
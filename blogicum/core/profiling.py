@@ -0,0 +1,110 @@
+"""Профилирование отдельных запросов по подписанному токену.
+
+Токен выдаёт команда profile_token; сотрудник передаёт его в параметре
+?_profile= или заголовке X-Profile, и ProfilingMiddleware выполняет
+запрос под cProfile (файл .prof) или статистическим сэмплером (стеки
+в формате collapsed для flamegraph.pl и speedscope). Файлы сохраняются
+в PROFILE_DIR с именем представления.
+"""
+import cProfile
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+SALT = 'core.profiling'
+
+
+def make_token(mode):
+    return signing.TimestampSigner(salt=SALT).sign(mode)
+
+
+def read_token(token):
+    """Режим из токена или None, если токен поддельный или устарел."""
+    try:
+        mode = signing.TimestampSigner(salt=SALT).unsign(
+            token, max_age=settings.PROFILE_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    return mode if mode in PROFILERS else None
+
+
+class CProfileProfiler:
+    extension = 'prof'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def save(self, path):
+        self.profile.dump_stats(path)
+
+
+class StackSampler:
+    """Раз в PROFILE_SAMPLE_INTERVAL секунд снимает стек потока запроса.
+
+    В отличие от cProfile почти не замедляет сам запрос, поэтому
+    соотношение времени SQL, шаблонов и Python ближе к реальному.
+    """
+
+    extension = 'collapsed'
+
+    def __init__(self):
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.target = threading.get_ident()
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        interval = settings.PROFILE_SAMPLE_INTERVAL
+        while not self.stopped.wait(interval):
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                module = frame.f_globals.get('__name__', '?')
+                stack.append(f'{module}:{frame.f_code.co_name}')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f'{stack} {count}\n')
+
+
+PROFILERS = {
+    'cprofile': CProfileProfiler,
+    'sample': StackSampler,
+}
+
+
+def view_tag(request):
+    match = request.resolver_match
+    if match is None:
+        return 'unresolved'
+    view = getattr(match.func, 'view_class', match.func)
+    return view.__name__
+
+
+def profile_path(request, profiler):
+    directory = Path(settings.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%S%f')
+    return directory / f'{view_tag(request)}-{stamp}.{profiler.extension}'
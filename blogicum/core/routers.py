@@ -0,0 +1,44 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Состояние текущего запроса, см. core.middleware.ReplicaPinningMiddleware.
+request_state = ContextVar('replica_request_state', default=None)
+
+
+class ReplicaState:
+    def __init__(self, replica, pinned):
+        self.replica = replica
+        self.pinned = pinned
+        self.wrote = False
+
+
+class ReplicaRouter:
+    """Направляет чтение в рамках запроса в реплику, запись — в default.
+
+    Вне запроса (команды, фоновые задачи) и после записи в том же запросе
+    чтение тоже идёт в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = request_state.get()
+        if state is None or state.pinned:
+            return 'default'
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = request_state.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
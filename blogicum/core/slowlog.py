@@ -0,0 +1,103 @@
+"""Журнал медленных SQL-запросов в формате NDJSON.
+
+Обёртка slow_query_wrapper ставится на каждое соединение (core.db)
+и записывает запросы дольше SLOW_QUERY_THRESHOLD_MS. Отчёт строит
+команда slow_query_report.
+"""
+import hashlib
+import json
+import logging
+import re
+import sys
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+from django.views import View
+
+logger = logging.getLogger('blogicum.slow_queries')
+logger.propagate = False
+
+PROJECT_DIR = str(Path(__file__).resolve().parent.parent)
+
+WHITESPACE_RE = re.compile(r'\s+')
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER_LIST_RE = re.compile(r'\(\?(?:, \?)+\)')
+
+
+def normalize_sql(sql):
+    """Запрос без значений: одинаковые запросы с разными id совпадают."""
+    sql = WHITESPACE_RE.sub(' ', sql).strip()
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql.replace('%s', '?'))
+    return PLACEHOLDER_LIST_RE.sub('(...)', sql)
+
+
+def fingerprint(params):
+    return hashlib.sha1(repr(params).encode()).hexdigest()[:12]
+
+
+def query_origin():
+    """Метод представления, из которого выполнен запрос.
+
+    Сначала ищется код проекта внутри представления (например,
+    CategoryListView.get_queryset), затем любой метод представления,
+    затем любая функция проекта (команды, фоновые задачи).
+    """
+    view_method = project_function = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        in_project = (code.co_filename.startswith(PROJECT_DIR)
+                      and code.co_filename != __file__)
+        instance = frame.f_locals.get('self')
+        if isinstance(instance, View):
+            name = f'{type(instance).__name__}.{code.co_name}'
+            if in_project:
+                return name
+            view_method = view_method or name
+        elif in_project and project_function is None:
+            module = frame.f_globals.get('__name__')
+            project_function = f'{module}.{code.co_name}'
+        frame = frame.f_back
+    return view_method or project_function
+
+
+def get_logger():
+    if not logger.handlers:
+        path = Path(settings.SLOW_QUERY_LOG)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path, maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+            backupCount=settings.SLOW_QUERY_LOG_BACKUPS, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+    return logger
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = (time.perf_counter() - start) * 1000
+        if duration >= threshold:
+            rows = context['cursor'].rowcount
+            get_logger().info(json.dumps({
+                'time': timezone.now().isoformat(),
+                'database': context['connection'].alias,
+                'sql': normalize_sql(sql),
+                'params': fingerprint(params),
+                'duration_ms': round(duration, 3),
+                # Для SELECT SQLite не сообщает число строк.
+                'rows': rows if rows >= 0 else None,
+                'many': many,
+                'origin': query_origin(),
+            }, ensure_ascii=False))
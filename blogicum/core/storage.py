@@ -0,0 +1,60 @@
+import gzip
+import logging
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Bootstrap, скачанный командой vendor_bootstrap.
+BOOTSTRAP_CSS_PATH = 'vendor/bootstrap/bootstrap.min.css'
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хэширует имена статических файлов и сжимает их при сборке.
+
+    Рядом с каждым файлом с хэшем в имени сохраняются копии .gz и, если
+    установлен brotli, .br: веб-сервер отдаёт их без сжатия на лету
+    (gzip_static и brotli_static в nginx).
+    """
+
+    compress_extensions = (
+        '.css', '.js', '.map', '.svg', '.ico', '.json', '.txt', '.xml')
+
+    def stored_name(self, name):
+        # Файл, не попавший в collectstatic, даёт битую ссылку, а не
+        # ошибку 500 на каждой странице с тегом {% static %}.
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            logger.warning('Нет записи в манифесте статики для %s', name)
+            return name
+
+    def post_process(self, *args, **kwargs):
+        yield from super().post_process(*args, **kwargs)
+        if kwargs.get('dry_run'):
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(self.compress_extensions):
+                self.compress(name)
+
+    def compressors(self):
+        yield '.gz', lambda content: gzip.compress(content, 9, mtime=0)
+        if brotli is not None:
+            yield '.br', lambda content: brotli.compress(content, quality=11)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        for suffix, compressor in self.compressors():
+            compressed = compressor(content)
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
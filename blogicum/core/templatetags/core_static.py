@@ -0,0 +1,45 @@
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django_bootstrap5.templatetags.django_bootstrap5 import bootstrap_css
+
+from core.storage import BOOTSTRAP_CSS_PATH
+
+register = template.Library()
+
+
+# Настройки, от которых зависит, найдётся ли файл статики.
+STATIC_SETTINGS = {
+    'STATIC_ROOT', 'STATICFILES_DIRS', 'STATICFILES_FINDERS',
+    'STATICFILES_STORAGE'}
+
+
+@lru_cache(maxsize=None)
+def has_static(path):
+    """Проверяет файл один раз на процесс, а не при каждой отрисовке.
+
+    В разработке файл лежит в STATICFILES_DIRS, после collectstatic —
+    в STATIC_ROOT. После vendor_bootstrap процесс нужно перезапустить.
+    """
+    return staticfiles_storage.exists(path) or bool(finders.find(path))
+
+
+@register.simple_tag
+def bootstrap_stylesheet():
+    """Bootstrap из статики проекта, а до vendor_bootstrap — с CDN."""
+    if has_static(BOOTSTRAP_CSS_PATH):
+        return format_html(
+            '<link rel="stylesheet" href="{}">', static(BOOTSTRAP_CSS_PATH))
+    return bootstrap_css()
+
+
+@receiver(setting_changed)
+def reset_static_lookups(setting, **kwargs):
+    if setting in STATIC_SETTINGS:
+        has_static.cache_clear()
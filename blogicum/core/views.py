@@ -0,0 +1,80 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import constant_time_compare
+from django.utils.http import http_date
+
+from core.metrics import render_metrics
+
+# Имена вида <хэш содержимого>[_вариант].ext, см. blog.thumbnails.
+HASHED_NAME_RE = re.compile(r'^[0-9a-f]{16}(_\w+)?\.\w+$')
+
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def serve_media(request, path):
+    """Отдаёт загруженные файлы с валидаторами кэша.
+
+    В режимах x-accel-redirect и x-sendfile тело ответа отправляет
+    веб-сервер, а Django только проверяет файл и выставляет заголовки.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        file_stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404
+    etag = f'"{file_stat.st_size:x}-{file_stat.st_mtime_ns:x}"'
+    last_modified = int(file_stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    if response is None:
+        mode = settings.MEDIA_SERVE_MODE
+        if mode == 'x-accel-redirect':
+            response = HttpResponse()
+            response['X-Accel-Redirect'] = (
+                settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path))
+        elif mode == 'x-sendfile':
+            response = HttpResponse()
+            response['X-Sendfile'] = full_path
+        else:
+            # wsgi.file_wrapper позволяет серверу отправить файл через
+            # sendfile() без копирования в Python.
+            response = FileResponse(open(full_path, 'rb'))
+        content_type, encoding = mimetypes.guess_type(full_path)
+        response['Content-Type'] = (
+            content_type or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if HASHED_NAME_RE.match(os.path.basename(path)):
+        response['Cache-Control'] = (
+            f'public, max-age={IMMUTABLE_MAX_AGE}, immutable')
+    else:
+        response['Cache-Control'] = (
+            f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}')
+    return response
+
+
+def metrics(request):
+    """Гистограммы PerformanceMiddleware для Prometheus.
+
+    Доступны по токену PERF_METRICS_TOKEN и сотрудникам.
+    """
+    token = settings.PERF_METRICS_TOKEN
+    has_token = token and constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not has_token and not request.user.is_staff:
+        raise Http404
+    return HttpResponse(
+        render_metrics(), content_type='text/plain; version=0.0.4')
@@ -0,0 +1,64 @@
+import json
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+from blog.models import Category, Comment, Post, User
+
+FIXTURE = settings.BASE_DIR.parent / "db.json"
+
+
+def fixture_counts(model):
+    with FIXTURE.open(encoding="utf-8") as stream:
+        return sum(obj["model"] == model for obj in json.load(stream))
+
+
+@pytest.mark.django_db
+def test_bulk_loaddata_json():
+    call_command(
+        "bulk_loaddata", FIXTURE, "--keep-indexes", "--batch-size", "7",
+        stdout=StringIO())
+    assert Post.objects.count() == fixture_counts("blog.post"), (
+        "Убедитесь, что команда bulk_loaddata загружает все публикации"
+        " из фикстуры."
+    )
+    assert User.objects.count() == fixture_counts("auth.user")
+    category = Category.objects.get(pk=1)
+    assert category.created_at.isoformat().startswith("2022-12-18T23:03:52"), (
+        "Убедитесь, что даты из фикстуры сохраняются без изменений."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_loaddata_ndjson_with_deferred_indexes(tmp_path):
+    fixture = tmp_path / "data.ndjson"
+    # Комментарии идут раньше публикаций и пользователей.
+    objects = [
+        {"model": "blog.comment", "pk": i, "fields": {
+            "text": "Текст", "post": 1, "author": 1,
+            "created_at": "2023-01-01T00:00:00Z"}}
+        for i in range(1, 4)
+    ] + [
+        {"model": "blog.post", "pk": 1, "fields": {
+            "title": "Пост", "text": "Текст", "author": 1,
+            "pub_date": "2023-01-01T00:00:00Z"}},
+        {"model": "auth.user", "pk": 1, "fields": {
+            "username": "loader", "password": "!"}},
+    ]
+    fixture.write_text("\n".join(json.dumps(obj) for obj in objects))
+    out = StringIO()
+    call_command("bulk_loaddata", fixture, "--batch-size", "2", stdout=out)
+    assert Comment.objects.count() == 3
+    assert Post.objects.get(pk=1).comment_count == 3, (
+        "Убедитесь, что после загрузки пересчитывается число комментариев."
+    )
+    with connection.cursor() as cursor:
+        indexes = connection.introspection.get_constraints(
+            cursor, Post._meta.db_table)
+    assert {index.name for index in Post._meta.indexes} <= set(indexes), (
+        "Убедитесь, что индексы публикаций восстанавливаются после загрузки."
+    )
+    assert "объектов/с" in out.getvalue()
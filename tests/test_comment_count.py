@@ -0,0 +1,99 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models.signals import post_delete
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post, deleting_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_comment_count_follows_views(
+        user_client, post_with_published_location):
+    post = post_with_published_location
+    for text in ("Первый", "Второй"):
+        user_client.post(f"/posts/{post.id}/comment/", data={"text": text})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при добавлении комментария увеличивается"
+        " счётчик комментариев публикации."
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что при удалении комментария уменьшается"
+        " счётчик комментариев публикации."
+    )
+
+
+def test_comment_count_bulk_delete_and_recount(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    Comment.objects.filter(
+        pk__in=Comment.objects.filter(post=post).values("pk")[:2]).delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    call_command("recount_comments", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+
+def test_post_delete_does_not_update_count_per_comment(
+        mixer, user, published_category, published_location):
+    def delete_queries(comments):
+        post = mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=published_location)
+        mixer.cycle(comments).blend("blog.Comment", post=post)
+        with CaptureQueriesContext(connection) as queries:
+            post.delete()
+        return [q["sql"] for q in queries.captured_queries]
+
+    few, many = delete_queries(2), delete_queries(30)
+    assert len(many) == len(few) <= 5, (
+        "Убедитесь, что число запросов при удалении публикации не зависит"
+        " от числа её комментариев."
+    )
+    assert not any(sql.startswith("UPDATE") for sql in many)
+
+
+def test_post_queryset_delete_does_not_update_count_per_comment(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(10).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as queries:
+        Post.objects.filter(pk=post.pk).delete()
+    assert not any(
+        q["sql"].startswith("UPDATE") for q in queries.captured_queries)
+    assert not deleting_posts.get()
+
+
+def test_failed_post_delete_keeps_comment_counting(
+        mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+
+    def fail(**kwargs):
+        raise RuntimeError
+
+    post_delete.connect(fail, sender=Post)
+    try:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            post.delete()
+    finally:
+        post_delete.disconnect(fail, sender=Post)
+    assert not deleting_posts.get(), (
+        "Убедитесь, что отметка удаляемой публикации снимается, даже если"
+        " удаление завершилось ошибкой."
+    )
+    Comment.objects.filter(post=post).first().delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1
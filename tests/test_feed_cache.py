@@ -0,0 +1,89 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post, published_now
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_feed_served_from_cache(
+        client, post_with_published_location):
+    client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/")
+    assert response.status_code == 200
+    assert post_with_published_location.title in response.content.decode(
+        "utf-8")
+    assert not queries.captured_queries, (
+        "Убедитесь, что повторный анонимный запрос ленты отдаётся из кэша."
+    )
+
+
+def test_feed_cache_purged_on_changes(
+        client, user_client, post_with_published_location):
+    post = post_with_published_location
+    client.get("/")
+    user_client.post(
+        f"/posts/{post.id}/comment/", data={"text": "Комментарий"})
+    assert "Комментарии (1)" in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что кэш ленты сбрасывается при добавлении комментария."
+    )
+
+
+@override_settings(PUBLISHED_NOW_GRANULARITY=0)
+def test_feed_cache_bounded_by_scheduled_post(
+        client, mixer, user, post_with_published_location):
+    scheduled = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=post_with_published_location.category,
+        is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    response = client.get("/")
+    view = response.resolver_match.func.view_class()
+    view.request = response.wsgi_request
+    assert 0 < view.get_cache_timeout() <= 30, (
+        "Убедитесь, что время жизни кэша ленты не превышает срока до"
+        " ближайшей отложенной публикации."
+    )
+    assert scheduled.title not in response.content.decode("utf-8")
+
+
+def test_authenticated_feed_not_cached(
+        user_client, post_with_published_location):
+    user_client.get("/")
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get("/")
+    assert queries.captured_queries
+
+
+@override_settings(PUBLISHED_NOW_GRANULARITY=60)
+def test_published_feed_query_stable_within_granularity(monkeypatch):
+    start = timezone.now().replace(second=1, microsecond=0)
+    monkeypatch.setattr(timezone, "now", lambda: start)
+    first = Post.published.all().query.sql_with_params()
+    monkeypatch.setattr(
+        timezone, "now", lambda: start + timedelta(seconds=58))
+    second = Post.published.all().query.sql_with_params()
+    assert first == second, (
+        "Убедитесь, что в пределах шага округления запрос ленты"
+        " опубликованных постов не меняется."
+    )
+    assert published_now() == start.replace(second=0)
+
+
+def test_bench_feed_bypasses_cache(post_with_published_location):
+    out = StringIO()
+    call_command("bench_feed", "--repeat", "3", stdout=out)
+    assert out.getvalue().count("median") == 3, (
+        "Убедитесь, что bench_feed замеряет ленты при повторных запусках,"
+        " не попадая в кэш страниц."
+    )
@@ -0,0 +1,72 @@
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Count, F
+
+from blog.models import Category, Comment, Location, Post, User
+
+pytestmark = [pytest.mark.django_db]
+
+
+def generate(**options):
+    call_command(
+        "generate_blog_data", "--keep-indexes", "--users", "5",
+        "--categories", "3", "--locations", "4", "--posts", "200",
+        "--comments", "600", "--now", "2024-01-01T00:00:00Z",
+        *(f"--{name}={value}" for name, value in options.items()),
+        stdout=StringIO())
+
+
+def snapshot():
+    return list(Post.objects.order_by("pk").values_list(
+        "title", "pub_date", "is_published", "comment_count"))
+
+
+def test_generate_blog_data():
+    generate(**{"future-fraction": 0.25, "unpublished-ratio": 0.1})
+    assert Post.objects.count() == 200
+    assert Comment.objects.count() == 600
+    assert User.objects.count() == 5
+    assert Category.objects.count() == 3
+    assert Location.objects.count() == 4
+    future = Post.objects.filter(pub_date__gt="2024-01-01T00:00:00Z")
+    assert 20 < future.count() < 80, (
+        "Убедитесь, что доля отложенных публикаций задаётся параметром"
+        " --future-fraction."
+    )
+    assert not future.filter(comment_count__gt=0).exists()
+    assert Post.objects.filter(is_published=False).exists()
+    mismatched = Post.objects.annotate(
+        real=Count("comments")).exclude(real=F("comment_count"))
+    assert not mismatched.exists(), (
+        "Убедитесь, что comment_count совпадает с числом комментариев."
+    )
+    counts = sorted(
+        Post.objects.values_list("comment_count", flat=True), reverse=True)
+    assert sum(counts[:20]) > sum(counts) / 2, (
+        "Убедитесь, что комментарии распределены по степенному закону."
+    )
+
+
+def test_generate_blog_data_is_deterministic():
+    generate(seed=3)
+    first = snapshot()
+    Post.objects.all().delete()
+    generate(seed=3)
+    assert snapshot() == first, (
+        "Убедитесь, что при одинаковом --seed создаются одинаковые данные."
+    )
+
+
+@pytest.mark.parametrize("options", [
+    {"users": 0},
+    {"categories": 0},
+    {"posts": 0},
+    {"batch-size": 0},
+    {"future-fraction": 1.5},
+])
+def test_generate_blog_data_rejects_bad_options(options):
+    with pytest.raises(CommandError):
+        generate(**options)
+    assert not Post.objects.exists()
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from core.jobs import claim_job, enqueue
+from core.models import Job
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_stale_running_job_is_reclaimed(settings):
+    job = enqueue("blog.tasks.process_post_image", post_id=1)
+    assert claim_job().pk == job.pk
+    assert claim_job() is None, (
+        "Убедитесь, что выполняющаяся задача не выдаётся второму обработчику."
+    )
+    Job.objects.filter(pk=job.pk).update(
+        started_at=timezone.now() - timedelta(
+            seconds=settings.JOB_TIMEOUT + 1))
+    reclaimed = claim_job()
+    assert reclaimed is not None and reclaimed.pk == job.pk, (
+        "Убедитесь, что задача, зависшая дольше JOB_TIMEOUT, берётся заново."
+    )
+    assert reclaimed.attempts == 2
+
+
+def test_stale_job_fails_after_max_attempts(settings):
+    job = enqueue("blog.tasks.process_post_image", post_id=1)
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.RUNNING,
+        attempts=settings.JOB_MAX_ATTEMPTS,
+        started_at=timezone.now() - timedelta(
+            seconds=settings.JOB_TIMEOUT + 1))
+    assert claim_job() is None
+    job.refresh_from_db()
+    assert job.status == Job.FAILED
@@ -0,0 +1,62 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    (tmp_path / "posts_images").mkdir()
+    (tmp_path / "posts_images" / "photo.jpg").write_bytes(b"jpeg")
+    (tmp_path / "posts_images" / "0123456789abcdef_card.webp").write_bytes(
+        b"webp")
+    return tmp_path
+
+
+def test_media_served_with_validators(client):
+    response = client.get("/media/posts_images/photo.jpg")
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == b"jpeg"
+    assert response["Content-Type"] == "image/jpeg"
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"), (
+        "Убедитесь, что медиафайлы отдаются с заголовками ETag и"
+        " Last-Modified."
+    )
+    assert "immutable" not in response["Cache-Control"]
+
+    response = client.get(
+        "/media/posts_images/photo.jpg",
+        HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304, (
+        "Убедитесь, что при совпадении ETag возвращается ответ 304."
+    )
+
+
+def test_hashed_media_cached_forever(client):
+    response = client.get("/media/posts_images/0123456789abcdef_card.webp")
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/webp"
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хэшем содержимого в имени кэшируются"
+        " бессрочно."
+    )
+
+
+def test_media_outside_root_not_served(client):
+    assert client.get("/media/../settings.py").status_code == 404
+    assert client.get("/media/posts_images/").status_code == 404
+    assert client.get("/media/posts_images/missing.jpg").status_code == 404
+
+
+def test_media_offloaded_to_web_server(client, settings, media_root):
+    settings.MEDIA_SERVE_MODE = "x-accel-redirect"
+    response = client.get("/media/posts_images/photo.jpg")
+    assert response["X-Accel-Redirect"] == (
+        "/protected-media/posts_images/photo.jpg")
+    assert not response.content
+
+    settings.MEDIA_SERVE_MODE = "x-sendfile"
+    response = client.get("/media/posts_images/photo.jpg")
+    assert response["X-Sendfile"] == str(
+        media_root / "posts_images" / "photo.jpg")
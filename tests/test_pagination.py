@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.views.post_views import PostListView
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def cursor_pagination(monkeypatch):
+    monkeypatch.setattr(PostListView, "cursor_pagination", True)
+
+
+@pytest.fixture
+def many_posts(mixer: Mixer, user, published_category, published_location):
+    now = timezone.now()
+    same_date = now - timedelta(days=1)
+    return mixer.cycle(N_PER_PAGE * 2 + 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        # Одинаковая дата у части постов проверяет сортировку по id.
+        pub_date=(
+            same_date if i % 3 else now - timedelta(days=i + 2)
+            for i in range(N_PER_PAGE * 2 + 3)
+        ),
+    )
+
+
+@pytest.mark.usefixtures("cursor_pagination")
+def test_cursor_pagination(client, many_posts):
+    seen = []
+    url = "/"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, (
+            "Убедитесь, что страницы ленты с курсором загружаются без ошибок."
+        )
+        page_obj = response.context["page_obj"]
+        seen.extend(post.id for post in page_obj)
+        next_cursor = page_obj.next_cursor
+        url = f"/?after={next_cursor}" if next_cursor else None
+    expected = sorted(
+        many_posts, key=lambda post: (post.pub_date, post.id), reverse=True)
+    assert seen == [post.id for post in expected], (
+        "Убедитесь, что курсорная пагинация выводит каждый пост ровно один"
+        " раз в порядке убывания даты публикации."
+    )
+
+
+@pytest.mark.usefixtures("cursor_pagination")
+def test_cursor_pagination_has_no_count_query(client, many_posts):
+    first_page = client.get("/").context["page_obj"]
+    with CaptureQueriesContext(connection) as queries:
+        client.get(f"/?after={first_page.next_cursor}")
+    assert not any("COUNT(*)" in q["sql"] for q in queries.captured_queries), (
+        "Убедитесь, что курсорная пагинация не выполняет запрос COUNT(*)."
+    )
+
+
+@pytest.mark.usefixtures("cursor_pagination")
+def test_cursor_pagination_previous_page(client, many_posts):
+    first_page = client.get("/").context["page_obj"]
+    second_page = client.get(
+        f"/?after={first_page.next_cursor}").context["page_obj"]
+    previous_page = client.get(
+        f"/?before={second_page.previous_cursor}").context["page_obj"]
+    assert [post.id for post in previous_page] == [
+        post.id for post in first_page
+    ], "Убедитесь, что ссылка на предыдущую страницу ведёт на первую страницу."
+    assert not previous_page.has_previous()
+
+
+@pytest.mark.usefixtures("cursor_pagination")
+def test_cursor_pagination_bad_cursor(client, many_posts):
+    assert client.get("/?after=garbage").status_code == 404
+
+
+@override_settings(COMMENTS_ON_PAGE=3)
+def test_comments_pagination(client, mixer, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(7).blend("blog.Comment", post=post)
+    page = client.get(f"/posts/{post.id}/").context["comments"]
+    assert [c.id for c in page] == [c.id for c in comments[:3]], (
+        "Убедитесь, что на странице публикации выводится ограниченное"
+        " число первых комментариев."
+    )
+    seen = [c.id for c in page]
+    while page.has_next():
+        response = client.get(
+            f"/posts/{post.id}/comments/?after={page.next_cursor}")
+        assert response.status_code == 200
+        page = response.context["comments"]
+        seen.extend(c.id for c in page)
+    assert seen == [c.id for c in comments], (
+        "Убедитесь, что подгрузка комментариев выводит каждый комментарий"
+        " ровно один раз."
+    )
+
+
+def test_comments_of_hidden_post_not_loaded(
+        client, mixer, unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    assert client.get(f"/posts/{post.id}/comments/").status_code == 404
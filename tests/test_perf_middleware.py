@@ -0,0 +1,70 @@
+import re
+
+import pytest
+
+from core import metrics
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def sampling(settings):
+    settings.PERF_SAMPLE_RATE = 1
+
+
+@pytest.mark.usefixtures("sampling")
+def test_server_timing_header(client, post_with_published_location):
+    post = post_with_published_location
+    response = client.get(f"/posts/{post.id}/")
+    timing = response["Server-Timing"]
+    queries = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', timing)
+    assert queries and int(queries.group(1)) > 0, (
+        "Убедитесь, что в заголовке Server-Timing указано число и время"
+        " SQL-запросов."
+    )
+    assert "tpl;dur=" in timing and "total;dur=" in timing
+
+
+@pytest.mark.usefixtures("sampling")
+def test_metrics_endpoint(
+        client, admin_client, post_with_published_location):
+    before = metrics.REQUEST_DURATION.series.get(
+        "blog:post_detail", ([0], 0))[0][:]
+    client.get(f"/posts/{post_with_published_location.id}/")
+    response = admin_client.get("/metrics/")
+    assert response.status_code == 200
+    text = response.content.decode()
+    count = re.search(
+        r'blogicum_request_duration_seconds_count'
+        r'\{view="blog:post_detail"\} (\d+)', text)
+    assert count and int(count.group(1)) == sum(before) + 1, (
+        "Убедитесь, что /metrics/ отдаёт гистограммы по имени маршрута."
+    )
+    assert (
+        'blogicum_response_size_bytes_bucket{view="blog:post_detail"' in text)
+
+
+def test_metrics_access(client, settings):
+    settings.PERF_METRICS_TOKEN = "secret"
+    assert client.get("/metrics/").status_code == 404, (
+        "Убедитесь, что /metrics/ недоступна без токена, в том числе с"
+        " адреса 127.0.0.1 (так приходят запросы через прокси)."
+    )
+    assert client.get(
+        "/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code == 404
+    assert client.get(
+        "/metrics/", HTTP_AUTHORIZATION="Bearer secret").status_code == 200
+
+
+@pytest.mark.usefixtures("sampling")
+def test_template_time_of_cached_feed(client, post_with_published_location):
+    timing = client.get("/")["Server-Timing"]
+    render = re.search(r"tpl;dur=([\d.]+)", timing)
+    assert render and float(render.group(1)) > 0, (
+        "Убедитесь, что в Server-Timing учитывается отрисовка ленты,"
+        " которую кэш отрисовывает внутри представления."
+    )
+
+
+def test_no_header_when_sampling_off(client):
+    assert not client.get("/").has_header("Server-Timing")
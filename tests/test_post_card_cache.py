@@ -0,0 +1,47 @@
+import pytest
+from django.core.cache import cache
+
+from blog.cache import get_post_card, get_post_card_version
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_card_is_cached(client, post_with_published_location):
+    post = post_with_published_location
+    client.get("/")
+    post.refresh_from_db()
+    assert get_post_card(post, get_post_card_version()), (
+        "Убедитесь, что карточка публикации сохраняется в кэше."
+    )
+
+
+def test_post_card_invalidated_on_related_changes(
+        client, post_with_published_location):
+    post = post_with_published_location
+    client.get("/")
+
+    post.title = "Новый заголовок публикации"
+    post.save()
+    assert post.title in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что при изменении публикации её карточка обновляется."
+    )
+
+    post.category.title = "Новое название категории"
+    post.category.save()
+    assert post.category.title in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что при изменении категории карточки публикаций"
+        " обновляются."
+    )
+
+    post.location.name = "Новое местоположение"
+    post.location.save()
+    assert post.location.name in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что при изменении местоположения карточки публикаций"
+        " обновляются."
+    )
+
+
+def test_post_card_version_survives_eviction():
+    version = get_post_card_version()
+    cache.clear()
+    assert get_post_card_version() != version
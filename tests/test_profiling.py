@@ -0,0 +1,64 @@
+import pstats
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from core.profiling import make_token
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def profile_dir(settings, tmp_path):
+    settings.PROFILE_DIR = tmp_path
+    return tmp_path
+
+
+def get_token(mode):
+    out = StringIO()
+    call_command(
+        "profile_token", "--mode", mode, stdout=out, stderr=StringIO())
+    return out.getvalue().strip()
+
+
+def test_cprofile_by_query_parameter(
+        admin_client, profile_dir, post_with_published_location):
+    post = post_with_published_location
+    response = admin_client.get(
+        f"/posts/{post.id}/", {"_profile": get_token("cprofile")})
+    name = response["X-Profile"]
+    assert name.startswith("PostDetailView-") and name.endswith(".prof"), (
+        "Убедитесь, что файл профиля назван по представлению."
+    )
+    stats = pstats.Stats(str(profile_dir / name))
+    assert any(func[2] == "get_object" for func in stats.stats)
+
+
+def test_sampler_by_header(admin_client, profile_dir, user):
+    response = admin_client.get(
+        f"/profile/{user.username}/", HTTP_X_PROFILE=get_token("sample"))
+    name = response["X-Profile"]
+    assert name.startswith("ProfileDetailView-")
+    assert name.endswith(".collapsed")
+    for line in (profile_dir / name).read_text().splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0 and ";" in stack
+
+
+@pytest.mark.parametrize("token", [
+    "garbage", make_token("cprofile") + "x", make_token("unknown"),
+])
+def test_bad_token_is_ignored(admin_client, profile_dir, token):
+    response = admin_client.get("/", {"_profile": token})
+    assert response.status_code == 200
+    assert "X-Profile" not in response
+    assert not any(profile_dir.iterdir())
+
+
+def test_profiling_is_staff_only(user_client, profile_dir):
+    response = user_client.get("/", {"_profile": make_token("cprofile")})
+    assert "X-Profile" not in response, (
+        "Убедитесь, что профилирование доступно только сотрудникам."
+    )
+    assert not any(profile_dir.iterdir())
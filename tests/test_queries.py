@@ -0,0 +1,102 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.cache import FEED_PAGE_VERSION_KEY, get_version
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url, method="get", **kwargs):
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, method)(url, **kwargs)
+    return response, len(queries.captured_queries)
+
+
+def test_post_detail_queries(
+        client, mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(5).blend("blog.Comment", post=post)
+    response, n_queries = count_queries(client, f"/posts/{post.id}/")
+    assert response.status_code == 200
+    assert len(response.context["comments"]) == 5
+    assert n_queries <= 2, (
+        "Убедитесь, что страница публикации загружается не более чем"
+        " за два запроса к базе данных."
+    )
+
+
+@pytest.mark.parametrize("action", ["edit_comment", "delete_comment"])
+def test_comment_author_views_queries(
+        user, user_client, mixer, post_with_published_location, action):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    response, n_queries = count_queries(
+        user_client, f"/posts/{post.id}/{action}/{comment.id}/")
+    assert response.status_code == 200
+    # Сессия, пользователь и комментарий вместе с проверкой публикации.
+    assert n_queries <= 3, (
+        "Убедитесь, что комментарий и права на него проверяются одним"
+        " запросом к базе данных."
+    )
+
+
+def test_comment_of_another_post_not_found(
+        user, user_client, mixer, post_with_published_location,
+        post_with_another_category):
+    comment = mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user)
+    response = user_client.get(
+        f"/posts/{post_with_another_category.id}/edit_comment/{comment.id}/")
+    assert response.status_code == 404
+
+
+def test_post_edit_fetches_post_once(
+        user, user_client, post_with_published_location):
+    post = post_with_published_location
+    data = {
+        "title": "Новый заголовок",
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%d"),
+        "category": post.category_id,
+        "location": post.location_id,
+    }
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(f"/posts/{post.id}/edit/", data=data)
+    assert response.status_code == 302
+    post_queries = [
+        sql for sql in (q["sql"] for q in queries.captured_queries)
+        if sql.startswith("SELECT") and 'FROM "blog_post"' in sql
+        or sql.startswith('UPDATE "blog_post"')
+    ]
+    assert len(post_queries) == 2, (
+        "Убедитесь, что при редактировании публикации она запрашивается"
+        " из базы данных один раз."
+    )
+
+
+def test_bench_urls_has_no_n_plus_one(tmp_path):
+    report_path = tmp_path / "report.json"
+    call_command(
+        "bench_urls", "--posts", "15", "--comments", "15", "--repeat", "2",
+        "--output", str(report_path), stdout=StringIO())
+    report = json.loads(report_path.read_text())
+    assert "blog:index" in report["routes"]
+    assert "blog:delete_comment" in report["routes"]
+
+
+def test_bench_urls_keeps_site_cache():
+    cache.set("unrelated", "value")
+    feed_version = get_version(FEED_PAGE_VERSION_KEY)
+    call_command(
+        "bench_urls", "--posts", "15", "--comments", "15", "--repeat", "1",
+        stdout=StringIO())
+    assert cache.get("unrelated") == "value", (
+        "Убедитесь, что bench_urls не очищает кэш сайта."
+    )
+    assert get_version(FEED_PAGE_VERSION_KEY) == feed_version
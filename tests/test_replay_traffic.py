@@ -0,0 +1,48 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment
+from core.loadtest import Stats
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replay_traffic(tmp_path, mixer, post_with_published_location):
+    post = post_with_published_location
+    user = mixer.blend("auth.User", username="reader")
+    user.set_password("secret")
+    user.save()
+    log = tmp_path / "log.ndjson"
+    log.write_text("\n".join(json.dumps(entry) for entry in [
+        {"path": "/"},
+        {"path": f"/posts/{post.id}/"},
+        {"method": "POST", "path": f"/posts/{post.id}/comment/",
+         "user": "reader", "data": {"text": "Из журнала"}},
+        {"path": "/no-such-page/"},
+    ]))
+    output = tmp_path / "report.json"
+    call_command(
+        "replay_traffic", log, "--password", "secret", "--host",
+        "testserver", "--concurrency", "1", "--output", output,
+        stdout=StringIO(), stderr=StringIO())
+    assert Comment.objects.filter(text="Из журнала", author=user).exists(), (
+        "Убедитесь, что POST-запросы из журнала выполняются от имени"
+        " пользователя с токеном CSRF."
+    )
+    routes = json.loads(output.read_text())["routes"]
+    assert routes["blog:add_comment"]["errors"] == 0
+    assert routes["blog:index"]["requests"] == 1
+    assert routes["unresolved"]["error_rate"] == 1
+
+
+def test_latency_histogram():
+    stats = Stats()
+    for seconds in (0.001, 0.02, 0.02, 3):
+        stats.add("blog:index", seconds, ok=True)
+    route = stats.report(elapsed=2)["blog:index"]
+    assert route["rps"] == 2
+    assert route["histogram"]["le_5"] == 1
+    assert route["histogram"]["le_25"] == 3
+    assert route["histogram"]["le_inf"] == 4
@@ -0,0 +1,68 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.models import Post
+from core.middleware import ReplicaPinningMiddleware
+from core.routers import ReplicaRouter
+
+router = ReplicaRouter()
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica1"]
+
+
+def run(request, write=False):
+    """Прогоняет запрос через middleware и запоминает базу для чтения."""
+    seen = {}
+
+    def view(request):
+        seen["before_write"] = router.db_for_read(Post)
+        if write:
+            router.db_for_write(Post)
+            seen["after_write"] = router.db_for_read(Post)
+        return HttpResponse()
+
+    response = ReplicaPinningMiddleware(view)(request)
+    return response, seen
+
+
+def test_reads_go_to_replica_and_writes_to_primary():
+    response, seen = run(RequestFactory().get("/"))
+    assert seen["before_write"] == "replica1", (
+        "Убедитесь, что чтение в запросе направляется в реплику."
+    )
+    assert ReplicaPinningMiddleware.cookie_name not in response.cookies
+    assert router.db_for_write(Post) == "default"
+    assert router.db_for_read(Post) == "default", (
+        "Убедитесь, что вне запроса чтение идёт из основной базы."
+    )
+
+
+def test_reads_pinned_to_primary_after_write(settings):
+    response, seen = run(RequestFactory().post("/posts/create/"), write=True)
+    assert seen["before_write"] == "default"
+    assert seen["after_write"] == "default"
+    cookie = response.cookies[ReplicaPinningMiddleware.cookie_name]
+    assert cookie["max-age"] == settings.REPLICA_PIN_SECONDS
+
+    request = RequestFactory().get("/profile/user/")
+    request.COOKIES[ReplicaPinningMiddleware.cookie_name] = "1"
+    _, seen = run(request)
+    assert seen["before_write"] == "default", (
+        "Убедитесь, что после записи чтение пользователя идёт из основной"
+        " базы в течение REPLICA_PIN_SECONDS."
+    )
+
+
+def test_write_in_get_pins_rest_of_request():
+    response, seen = run(RequestFactory().get("/"), write=True)
+    assert seen == {"before_write": "replica1", "after_write": "default"}
+    assert ReplicaPinningMiddleware.cookie_name in response.cookies
+
+
+def test_no_migrations_on_replicas():
+    assert router.allow_migrate("replica1", "blog") is False
+    assert router.allow_migrate("default", "blog") is None
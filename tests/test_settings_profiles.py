@@ -0,0 +1,45 @@
+import importlib
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from core.apps import (
+    check_production_debug, check_production_secret_key)
+
+
+def test_prod_profile_has_no_debug_tools(monkeypatch):
+    monkeypatch.setenv("DJANGO_ALLOWED_HOSTS", "blogicum.example, www.x.ru")
+    prod = importlib.reload(importlib.import_module("blogicum.settings.prod"))
+    assert not prod.DEBUG
+    assert "debug_toolbar" not in prod.INSTALLED_APPS
+    assert not any("debug_toolbar" in m for m in prod.MIDDLEWARE), (
+        "Убедитесь, что в профиле prod не подключена панель отладки."
+    )
+    options = prod.TEMPLATES[0]["OPTIONS"]
+    assert "django.template.context_processors.debug" not in (
+        options["context_processors"])
+    assert options["loaders"][0][0] == (
+        "django.template.loaders.cached.Loader")
+    assert prod.DATABASES["default"]["CONN_MAX_AGE"] > 0
+    assert prod.ALLOWED_HOSTS == ["blogicum.example", "www.x.ru"]
+
+
+def test_debug_refused_in_prod_profile():
+    with override_settings(SETTINGS_PROFILE="prod", DEBUG=True):
+        with pytest.raises(ImproperlyConfigured):
+            check_production_debug()
+    with override_settings(SETTINGS_PROFILE="prod", DEBUG=False):
+        check_production_debug()
+
+
+def test_insecure_secret_key_refused_in_prod_profile():
+    with override_settings(SETTINGS_PROFILE="prod",
+                           SECRET_KEY="django-insecure-abc"):
+        with pytest.raises(ImproperlyConfigured):
+            check_production_secret_key()
+    with override_settings(SETTINGS_PROFILE="prod", SECRET_KEY="x" * 50):
+        check_production_secret_key()
+    with override_settings(SETTINGS_PROFILE="dev",
+                           SECRET_KEY="django-insecure-abc"):
+        check_production_secret_key()
@@ -0,0 +1,76 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from core import slowlog
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def slow_log(settings, tmp_path):
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    settings.SLOW_QUERY_LOG = tmp_path / "slow.ndjson"
+    yield settings.SLOW_QUERY_LOG
+    for handler in slowlog.logger.handlers[:]:
+        slowlog.logger.removeHandler(handler)
+        handler.close()
+
+
+def test_normalize_sql():
+    assert slowlog.normalize_sql(
+        "SELECT *\n  FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"
+    ) == "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?"
+
+
+def test_slow_queries_are_attributed_to_views(
+        client, slow_log, published_category):
+    client.get(f"/category/{published_category.slug}/")
+    records = [json.loads(line) for line in slow_log.read_text().splitlines()]
+    assert records, "Убедитесь, что медленные запросы пишутся в журнал."
+    assert any(
+        (record["origin"] or "").startswith("CategoryListView.")
+        for record in records
+    ), "Убедитесь, что в журнале указано представление, выполнившее запрос."
+    assert all("%s" not in record["sql"] for record in records)
+
+
+def test_slow_query_report(client, slow_log, published_category):
+    for _ in range(3):
+        client.get(f"/category/{published_category.slug}/")
+    out = StringIO()
+    call_command("slow_query_report", "--json", "--order", "count",
+                 stdout=out)
+    report = json.loads(out.getvalue())
+    assert report and report[0]["count"] >= 3, (
+        "Убедитесь, что отчёт объединяет одинаковые запросы."
+    )
+    assert report[0]["count"] >= report[-1]["count"]
+
+
+def test_threshold_disables_log(client, settings, tmp_path,
+                                published_category):
+    settings.SLOW_QUERY_THRESHOLD_MS = None
+    settings.SLOW_QUERY_LOG = tmp_path / "slow.ndjson"
+    client.get(f"/category/{published_category.slug}/")
+    assert not settings.SLOW_QUERY_LOG.exists()
+
+
+def test_slow_query_report_skips_malformed_lines(settings, tmp_path):
+    record = {"sql": "SELECT ?", "params": "abc", "duration_ms": 5.0,
+              "rows": None, "many": False, "origin": "PostListView.get"}
+    log = tmp_path / "slow.ndjson"
+    log.write_text(
+        json.dumps(record) + "\n"
+        + json.dumps({"sql": "SELECT ?"}) + "\n"
+        + json.dumps(record)[:20] + "\n")
+    out = StringIO()
+    call_command("slow_query_report", "--log", str(log), stdout=out)
+    text = out.getvalue()
+    assert "Пропущено повреждённых строк: 2" in text, (
+        "Убедитесь, что отчёт пропускает повреждённые строки журнала и"
+        " сообщает их число."
+    )
+    assert "1 раз" in text and "PostListView.get (1)" in text
@@ -0,0 +1,56 @@
+import sqlite3
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+
+from core.db import apply_sqlite_pragmas
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_to_django_connection():
+    if connection.vendor != "sqlite":
+        pytest.skip("Тесты запущены не на SQLite")
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        assert cursor.fetchone()[0] == 1, (
+            "Убедитесь, что соединение SQLite настраивается с"
+            " synchronous=NORMAL."
+        )
+        cursor.execute("PRAGMA temp_store")
+        assert cursor.fetchone()[0] == 2
+
+
+@pytest.mark.parametrize("tuned", [False, True])
+def test_readers_not_blocked_by_writer(tmp_path, tuned):
+    path = tmp_path / "db.sqlite3"
+    pragmas = settings.SQLITE_PRAGMAS if tuned else {}
+    writer = sqlite3.connect(path, isolation_level=None)
+    apply_sqlite_pragmas(writer, pragmas)
+    writer.execute("CREATE TABLE comment (id INTEGER PRIMARY KEY)")
+    reader = sqlite3.connect(path, timeout=0)
+    writer.execute("BEGIN EXCLUSIVE")
+    writer.execute("INSERT INTO comment DEFAULT VALUES")
+    try:
+        if tuned:
+            assert reader.execute(
+                "SELECT count(*) FROM comment").fetchone() == (0,), (
+                "Убедитесь, что в режиме WAL чтение не ждёт записи."
+            )
+        else:
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                reader.execute("SELECT count(*) FROM comment")
+    finally:
+        writer.execute("COMMIT")
+        reader.close()
+        writer.close()
+
+
+def test_bench_sqlite_locks_runs():
+    out = StringIO()
+    call_command(
+        "bench_sqlite_locks", "--duration", "0.2", "--readers", "2",
+        stdout=out)
+    assert "SQLITE_PRAGMAS" in out.getvalue()
@@ -0,0 +1,108 @@
+import gzip
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.template import Context, Template
+
+
+@pytest.fixture
+def static_build(settings, tmp_path):
+    source = tmp_path / "static_dev"
+    (source / "img").mkdir(parents=True)
+    (source / "img" / "logo.png").write_bytes(b"png")
+    (source / "vendor" / "bootstrap").mkdir(parents=True)
+    (source / "vendor" / "bootstrap" / "bootstrap.min.css").write_text(
+        ".navbar { background: url('../../img/logo.png'); }\n" * 50)
+    settings.STATICFILES_DIRS = [source]
+    # Статика приложений (admin и др.) только замедляет сжатие brotli.
+    settings.STATICFILES_FINDERS = [
+        "django.contrib.staticfiles.finders.FileSystemFinder"]
+    settings.STATIC_ROOT = tmp_path / "static"
+    settings.STATICFILES_STORAGE = (
+        "core.storage.CompressedManifestStaticFilesStorage")
+    call_command("collectstatic", "--noinput", stdout=StringIO())
+    return settings.STATIC_ROOT
+
+
+def test_static_files_hashed_and_compressed(static_build):
+    manifest = json.loads((static_build / "staticfiles.json").read_text())
+    css = manifest["paths"]["vendor/bootstrap/bootstrap.min.css"]
+    logo = manifest["paths"]["img/logo.png"]
+    assert css != "vendor/bootstrap/bootstrap.min.css", (
+        "Убедитесь, что имена статических файлов содержат хэш содержимого."
+    )
+    content = (static_build / css).read_bytes()
+    assert logo.split("/")[-1].encode() in content, (
+        "Убедитесь, что ссылки внутри CSS заменяются на имена с хэшем."
+    )
+    assert gzip.decompress(
+        (static_build / f"{css}.gz").read_bytes()) == content, (
+        "Убедитесь, что для CSS создаётся сжатая копия .gz."
+    )
+    assert not (static_build / f"{logo}.gz").exists()
+
+
+def test_static_files_brotli_compressed(static_build):
+    brotli = pytest.importorskip("brotli")
+    manifest = json.loads((static_build / "staticfiles.json").read_text())
+    css = manifest["paths"]["vendor/bootstrap/bootstrap.min.css"]
+    assert brotli.decompress(
+        (static_build / f"{css}.br").read_bytes()) == (
+        static_build / css).read_bytes(), (
+        "Убедитесь, что для CSS создаётся сжатая копия .br."
+    )
+
+
+def test_templates_use_manifest_names(static_build, settings):
+    settings.DEBUG = False
+    html = Template(
+        "{% load static %}{% static 'vendor/bootstrap/bootstrap.min.css' %}"
+    ).render(Context())
+    manifest = json.loads((static_build / "staticfiles.json").read_text())
+    assert html == (
+        "/static/" + manifest["paths"]["vendor/bootstrap/bootstrap.min.css"])
+
+
+@pytest.mark.django_db
+def test_pages_render_with_missing_static_files(static_build, settings,
+                                                client):
+    settings.DEBUG = False
+    manifest = json.loads((static_build / "staticfiles.json").read_text())
+    response = client.get("/")
+    assert response.status_code == 200, (
+        "Убедитесь, что отсутствие файла в манифесте статики не ломает"
+        " страницы."
+    )
+    html = response.content.decode()
+    assert manifest["paths"]["vendor/bootstrap/bootstrap.min.css"] in html
+    assert "/static/img/fav/favicon.ico" in html
+
+
+@pytest.mark.django_db
+def test_bootstrap_falls_back_to_cdn(settings, tmp_path, client):
+    settings.STATICFILES_DIRS = [tmp_path]
+    settings.STATIC_ROOT = tmp_path / "static"
+    html = client.get("/").content.decode()
+    assert "cdn.jsdelivr.net/npm/bootstrap" in html, (
+        "Убедитесь, что до запуска vendor_bootstrap Bootstrap подключается"
+        " с CDN."
+    )
+    assert "vendor/bootstrap" not in html
+
+
+@pytest.mark.django_db
+def test_bootstrap_lookup_once_per_process(settings, tmp_path, client,
+                                           monkeypatch):
+    settings.STATICFILES_DIRS = [tmp_path]
+    calls = []
+    monkeypatch.setattr(
+        finders, "find", lambda path: calls.append(path))
+    for url in ("/", "/auth/login/"):
+        client.get(url)
+    assert len(calls) == 1, (
+        "Убедитесь, что наличие локального Bootstrap проверяется один раз,"
+        " а не при каждой отрисовке страницы."
+    )
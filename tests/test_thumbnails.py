@@ -0,0 +1,143 @@
+import os
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.models import Post
+from blog.thumbnails import variant_name
+from core.views import HASHED_NAME_RE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def make_image(size=(2000, 1000), **options):
+    content = BytesIO()
+    Image.new("RGB", size, "red").save(content, "JPEG", **options)
+    return SimpleUploadedFile(
+        "big.jpg", content.getvalue(), content_type="image/jpeg")
+
+
+def test_thumbnails_created_on_upload(
+        user_client, published_category, published_location):
+    user_client.post("/posts/create/", data={
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": "2020-01-01",
+        "category": published_category.id,
+        "location": published_location.id,
+        "image": make_image(),
+    })
+    post = Post.objects.get(title="С картинкой")
+    assert not post.has_thumbnails, (
+        "Убедитесь, что изображение обрабатывается вне запроса."
+    )
+    assert "Изображение обрабатывается" in user_client.get(
+        "/").content.decode("utf-8")
+
+    call_command("run_jobs", "--once", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.has_thumbnails, (
+        "Убедитесь, что фоновая задача создаёт миниатюры."
+    )
+    storage = post.image.storage
+    for variant, width in (("card", 640), ("detail", 1280)):
+        for extension in ("webp", "jpg"):
+            with storage.open(
+                    variant_name(post.image.name, variant, extension)) as f:
+                assert Image.open(f).size == (width, width // 2)
+    content = user_client.get("/").content.decode("utf-8")
+    assert post.card_image.webp in content
+    assert post.image.url in content
+
+
+def test_anonymous_feed_updated_after_processing(
+        client, user_client, published_category, published_location):
+    user_client.post("/posts/create/", data={
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": "2020-01-01",
+        "category": published_category.id,
+        "location": published_location.id,
+        "image": make_image(),
+    })
+    assert "Изображение обрабатывается" in client.get(
+        "/").content.decode("utf-8")
+    call_command("run_jobs", "--once", stdout=StringIO())
+    assert "Изображение обрабатывается" not in client.get(
+        "/").content.decode("utf-8"), (
+        "Убедитесь, что после обработки изображения сбрасывается кэш лент."
+    )
+
+
+def save_old_image(post):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera"
+    post.image.save("old.jpg", make_image(exif=exif.tobytes()), save=False)
+    # Изображение, загруженное до фоновой обработки, без задачи в очереди.
+    Post.objects.filter(pk=post.pk).update(
+        image=post.image.name, has_thumbnails=False)
+
+
+def test_thumbnails_backfill(mixer, post_with_published_location):
+    post = post_with_published_location
+    save_old_image(post)
+    call_command("generate_thumbnails", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.has_thumbnails
+    assert HASHED_NAME_RE.match(os.path.basename(post.image.name)), (
+        "Убедитесь, что старые изображения получают имя по хэшу"
+        " содержимого, как и новые."
+    )
+    with post.image.open("rb"):
+        assert not Image.open(post.image).getexif(), (
+            "Убедитесь, что из старых изображений удаляются метаданные."
+        )
+    assert post.image.storage.exists(
+        variant_name(post.image.name, "card", "webp"))
+
+
+def test_thumbnails_backfill_enqueue(mixer, post_with_published_location):
+    post = post_with_published_location
+    save_old_image(post)
+    call_command("generate_thumbnails", "--enqueue", stdout=StringIO())
+    post.refresh_from_db()
+    assert not post.has_thumbnails
+    call_command("run_jobs", "--once", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.has_thumbnails
+
+
+def test_invalid_image_removed_by_worker(mixer, post_with_published_location):
+    post = post_with_published_location
+    post.image.save(
+        "broken.jpg", SimpleUploadedFile("broken.jpg", b"not an image"))
+    call_command("run_jobs", "--once", stdout=StringIO())
+    post.refresh_from_db()
+    assert not post.image, (
+        "Убедитесь, что файл, не являющийся изображением, удаляется"
+        " при фоновой обработке."
+    )
+
+
+def test_worker_strips_exif_and_fixes_orientation(
+        mixer, post_with_published_location):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: поворот на 90°.
+    exif[0x010F] = "Camera"
+    post = post_with_published_location
+    post.image.save("photo.jpg", make_image((200, 100), exif=exif.tobytes()))
+    call_command("run_jobs", "--once", stdout=StringIO())
+    post.refresh_from_db()
+    with post.image.open("rb"):
+        image = Image.open(post.image)
+        assert image.size == (100, 200)
+        assert not image.getexif()